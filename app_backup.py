@@ -28,6 +28,30 @@ ctk.set_default_color_theme("blue")
 # Upgrade URL for upsell
 UPGRADE_URL = "https://www.codester.com"
 
+# Matches the OPENAI_API_KEY assignment line in a .env file (optionally exported)
+_ENV_KEY_RE = re.compile(r"\s*(?:export\s+)?OPENAI_API_KEY\s*=")
+
+# Memoized environment reads (invalidate an entry when the app writes that key)
+_ENV_CACHE: dict[str, str] = {}
+_MISSING = object()
+
+
+def get_env(key, default=""):
+    """
+    Read an environment variable once and serve later reads from a cache.
+    
+    Args:
+        key: Name of the environment variable.
+        default: Value to cache and return if the variable is not set.
+        
+    Returns:
+        str: The cached value of the variable.
+    """
+    value = _ENV_CACHE.get(key, _MISSING)
+    if value is not _MISSING:
+        return value
+    return _ENV_CACHE.setdefault(key, os.environ.get(key, default))
+
 
 def bind_clipboard_menu(widget):
     """
@@ -72,6 +96,9 @@ class App(ctk.CTk):
         self.is_generating = False
         self.current_chapter_index = 0
         self.total_chapters = 0
+        
+        # .env location used by the settings dialog (resolved once per session)
+        self._env_path = os.path.join(os.getcwd(), ".env")
 
         # Configure grid layout
         self.grid_columnconfigure(0, weight=1)
@@ -325,7 +352,7 @@ class App(ctk.CTk):
         ).pack(padx=20, pady=(20, 5), anchor="w")
 
         # Load current API key from environment
-        current_key = os.getenv("OPENAI_API_KEY", "")
+        current_key = get_env("OPENAI_API_KEY")
         
         api_key_entry = ctk.CTkEntry(
             dialog,
@@ -354,25 +381,30 @@ class App(ctk.CTk):
                 return
             
             # Save to .env file
-            env_path = os.path.join(os.getcwd(), ".env")
+            env_path = self._env_path
+            tmp_path = env_path + ".tmp"
             try:
-                # Read existing content
-                existing_lines = []
-                if os.path.exists(env_path):
-                    with open(env_path, 'r') as f:
-                        for line in f:
-                            stripped = line.strip()
-                            if stripped and not stripped.startswith("OPENAI_API_KEY"):
-                                existing_lines.append(line.rstrip())
+                # Stream existing content into a temp file, dropping the old key
+                # (64 KiB buffers so the rewrite is a handful of read/write calls)
+                with open(tmp_path, 'w', buffering=1 << 16) as fout:
+                    try:
+                        with open(env_path, 'r', buffering=1 << 16) as fin:
+                            # Only a final unterminated line lacks "\n"
+                            fout.writelines(
+                                line if line.endswith("\n") else line + "\n"
+                                for line in fin
+                                if not _ENV_KEY_RE.match(line)
+                            )
+                    except FileNotFoundError:
+                        pass
+                    fout.write(f"OPENAI_API_KEY={api_key}\n")
                 
-                # Write with new API key
-                with open(env_path, 'w') as f:
-                    for line in existing_lines:
-                        f.write(line + "\n")
-                    f.write(f"OPENAI_API_KEY={api_key}\n")
+                # Atomically replace the .env file
+                os.replace(tmp_path, env_path)
                 
                 # Update environment variable
                 os.environ["OPENAI_API_KEY"] = api_key
+                _ENV_CACHE["OPENAI_API_KEY"] = api_key
                 
                 # Reset the AI client to use new key
                 AIWorkerBase.reset_client()
@@ -25,6 +25,7 @@ Usage:
 """
 
 import os
+import re
 import sys
 import customtkinter as ctk
 from tkinter import messagebox
@@ -44,6 +45,9 @@ from database_manager import (
 # Apply scrollbar patch to prevent RecursionError in CTkScrollableFrame
 patch_ctk_scrollbar()
 
+# Basic email shape check for buyer emails: local@domain.tld
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
 
 class SplashScreen(ctk.CTkToplevel):
     """Splash screen with loading animation."""
@@ -658,7 +662,7 @@ class KeygenApp(ctk.CTk):
             messagebox.showerror("Error", "Please enter a buyer email address.")
             return
             
-        if '@' not in email or '.' not in email.split('@')[-1]:
+        if not _EMAIL_RE.match(email):
             messagebox.showerror("Error", "Please enter a valid email address.")
             return
         
@@ -0,0 +1,167 @@
+"""
+License Cache Module - Signed local record of the last successful license check.
+
+The existing-license check uses it to show the main UI on a warm start
+without waiting for Supabase. The live row is fetched right after, and a
+missing or revoked license then ends the session and clear()s the cache.
+The remote ban check never consults it.
+
+Cache file:
+    %APPDATA%/CourseSmithAI/license_cache.json  (~/CourseSmithAI on other OSes)
+    {"record": {"hwid": ..., "valid_until": ..., "checked_at": ..., "license": {...}},
+     "sig": ...}
+
+The record is signed with HMAC-SHA256 under a random per-device key kept in
+license_cache.key beside it (created on first save, owner-only permissions).
+The app's public Supabase key is not used, so a signed cache cannot be
+produced from anything shipped with the app. Any unreadable, unsigned or
+tampered file is treated as a cache miss.
+
+Usage:
+    from license_cache import load, save, is_fresh
+
+    record = load()
+    if not is_fresh(record, hwid):
+        ...  # query Supabase, then save(record)
+"""
+
+import os
+import hmac
+import json
+import secrets
+from datetime import datetime, timezone, timedelta
+
+CACHE_PATH = os.path.join(
+    os.environ.get('APPDATA', os.path.expanduser('~')),
+    'CourseSmithAI', 'license_cache.json'
+)
+
+# How long a successful online check is trusted for a warm start
+CACHE_TTL = timedelta(hours=6)
+
+# Length of the per-device signing key in bytes
+KEY_BYTES = 32
+
+
+def _key_path():
+    """Return the signing key's path (next to CACHE_PATH)."""
+    return os.path.join(os.path.dirname(CACHE_PATH), 'license_cache.key')
+
+
+def _device_key(create=False):
+    """
+    Return this device's signing key, creating it when asked.
+
+    Args:
+        create: Generate and store a new key if none exists yet.
+
+    Returns:
+        bytes or None: The key, or None if it is missing or unreadable.
+    """
+    path = _key_path()
+    try:
+        with open(path, 'rb') as f:
+            key = f.read()
+        if len(key) == KEY_BYTES:
+            return key
+        if not create:
+            return None
+    except OSError:
+        if not create:
+            return None
+    # No usable key: write a fresh one (owner-only where the OS supports it)
+    key = secrets.token_bytes(KEY_BYTES)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+    except OSError:
+        return None
+    return key
+
+
+def _sign(record, key):
+    """Return the hex HMAC-SHA256 of the canonical JSON form of record."""
+    msg = json.dumps(record, sort_keys=True, separators=(",", ":")).encode()
+    return hmac.new(key, msg=msg, digestmod="sha256").hexdigest()
+
+
+def load():
+    """
+    Read the cached license record if its signature checks out.
+
+    Returns:
+        dict or None: The cached record, or None on a miss or bad signature.
+    """
+    key = _device_key()
+    if key is None:
+        return None
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            blob = json.load(f)
+        record, sig = blob["record"], blob["sig"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(record, dict) or not isinstance(sig, str):
+        return None
+    if not hmac.compare_digest(sig, _sign(record, key)):
+        return None
+    return record
+
+
+def save(record):
+    """
+    Sign and persist a license record. Failures are ignored (cache only).
+
+    Args:
+        record: Dict with 'hwid', 'valid_until' and 'checked_at' ISO strings,
+            plus the optional 'license' row.
+    """
+    key = _device_key(create=True)
+    if key is None:
+        return
+    tmp_path = CACHE_PATH + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"record": record, "sig": _sign(record, key)}, f)
+        os.replace(tmp_path, CACHE_PATH)
+    except OSError:
+        pass
+
+
+def clear():
+    """Delete the cached record (e.g. after the license was revoked)."""
+    try:
+        os.remove(CACHE_PATH)
+    except OSError:
+        pass
+
+
+def is_fresh(record, hwid, now=None):
+    """
+    Check whether a cached record lets the caller skip the online check.
+
+    The record must belong to this device, have been checked within
+    CACHE_TTL, and its valid_until (if any) must still be in the future.
+
+    Args:
+        record: Record returned by load(), or None.
+        hwid: Current hardware ID.
+        now: Current UTC time (defaults to datetime.now(timezone.utc)).
+
+    Returns:
+        bool: True if the cached check can be trusted.
+    """
+    if not record or record.get("hwid") != hwid:
+        return False
+    now = now or datetime.now(timezone.utc)
+    try:
+        checked_at = datetime.fromisoformat(record["checked_at"])
+        valid_until = record.get("valid_until")
+        if valid_until and datetime.fromisoformat(valid_until.replace("Z", "+00:00")) <= now:
+            return False
+    except (KeyError, TypeError, ValueError):
+        return False
+    return timedelta(0) <= now - checked_at < CACHE_TTL
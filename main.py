@@ -4,33 +4,90 @@ A commercial desktop application to generate educational PDF books using AI with
 Features enterprise sidebar navigation and modern animations.
 """
 
+import io
 import os
+import importlib
+import re
 import sys
 import json
+import socket
+import secrets
+import time
+import bisect
+import logging
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
+from urllib.parse import urlparse
 from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Optional
+from dataclasses import dataclass
 import customtkinter as ctk
-from tkinter import messagebox
-from dotenv import load_dotenv
+from tkinter import messagebox, filedialog, TclError, EventType
 
 # Import HWID and license utilities from utils module
-from utils import get_hwid, parse_hwids_array, check_license, add_context_menu, patch_ctk_scrollbar
+from utils import (
+    get_hwid, check_license, add_context_menu, patch_ctk_scrollbar,
+    get_data_dir, generate_pdf, setup_global_window_shortcuts, license_covers_device,
+    LICENSE_COLUMNS,
+)
+
+# Import the course generation engine (openai itself is loaded lazily inside it)
+from coursesmith_engine import CourseSmithEngine
 
 # Import session manager for setting session data
 from session_manager import set_session, get_user_email, get_license_key
 
+# Signed on-disk record of the last successful remote license check
+import license_cache
+
 # Apply scrollbar patch to prevent RecursionError in CTkScrollableFrame
 patch_ctk_scrollbar()
 
 
+class _LogWriter(io.TextIOBase):
+    """
+    Line-buffered stand-in for sys.stdout/sys.stderr that forwards text to a log handler.
+    
+    print() writes the text and its newline separately. Holding partial lines
+    until a newline arrives means each print costs one handler emit (and one
+    file flush) instead of two, and a crash still only loses an unfinished line.
+    """
+    
+    def __init__(self, handler):
+        self._handler = handler
+        self._partial = ""
+    
+    def writable(self):
+        return True
+    
+    def write(self, text):
+        if text:
+            buffered = self._partial + text
+            cut = buffered.rfind("\n") + 1
+            self._partial = buffered[cut:]
+            if cut:
+                self._handler.handle(logging.makeLogRecord({"msg": buffered[:cut]}))
+        return len(text)
+    
+    def flush(self):
+        if self._partial:
+            self._handler.handle(logging.makeLogRecord({"msg": self._partial}))
+            self._partial = ""
+
+
 # Suppress stdout/stderr for --noconsole mode with log file fallback
 if hasattr(sys, 'frozen'):
-    # Redirect to log file instead of complete suppression for debugging
+    # Redirect to a size-capped rotating log file instead of complete suppression
     try:
         log_dir = os.path.join(os.environ.get('APPDATA', os.path.expanduser('~')), 'CourseSmithAI', 'logs')
         os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f'coursesmith_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-        sys.stdout = open(log_file, 'w', encoding='utf-8')
+        log_file = os.path.join(log_dir, 'coursesmith.log')
+        _log_handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=3, encoding='utf-8')
+        _log_handler.terminator = ""  # print() already supplies the newlines
+        logging.raiseExceptions = False  # Handler errors must not echo into the redirected stderr
+        sys.stdout = _LogWriter(_log_handler)
         sys.stderr = sys.stdout
     except:
         # If log file creation fails, suppress completely
@@ -50,26 +107,116 @@ if not SUPABASE_KEY:
     SUPABASE_KEY = "sb_publishable_tmwenU0VyOChNWKG90X_bw_HYf9X5kR"
 
 
-# Enterprise color scheme
-COLORS = {
-    'background': '#0B0E14',
-    'sidebar': '#151921',
-    'accent': '#7F5AF0',
-    'accent_hover': '#9D7BF5',
-    'text': '#E0E0E0',
-    'text_dim': '#808080'
-}
+# Enterprise color scheme (flat constants for the UI builders)
+C_BG = '#0B0E14'
+C_SIDEBAR = '#151921'
+C_ACCENT = '#7F5AF0'
+C_ACCENT_HOVER = '#9D7BF5'
+C_TEXT = '#E0E0E0'
+C_TEXT_DIM = '#808080'
+
+# Read-only name -> color view of the same palette
+COLORS = MappingProxyType({
+    'background': C_BG,
+    'sidebar': C_SIDEBAR,
+    'accent': C_ACCENT,
+    'accent_hover': C_ACCENT_HOVER,
+    'text': C_TEXT,
+    'text_dim': C_TEXT_DIM
+})
 
 # Button color constants for format selector - selected vs unselected states
 FORMAT_BTN_SELECTED = {"fg": "#7F5AF0", "hover": "#9D7BF5", "border": "#9D7BF5"}
 FORMAT_BTN_UNSELECTED = {"fg": "#2A3142", "hover": "#3A4152", "border": "#3A4152"}
 
+# Tier badge colors (read-only)
+TIER_COLORS = MappingProxyType({
+    "PROFESSIONAL": "#FFD700",  # Gold
+    "EXTENDED": "#00CED1",       # Dark Cyan/Turquoise
+    "STANDARD": "#87CEEB"        # Sky Blue
+})
+
+# Nav button looks by state; each transition is a single configure() call
+_NAV_STYLES = MappingProxyType({
+    "idle": MappingProxyType({"fg_color": "transparent", "text_color": C_TEXT}),
+    "hover": MappingProxyType({"fg_color": C_ACCENT_HOVER, "text_color": C_BG}),
+    "active": MappingProxyType({"fg_color": C_ACCENT, "text_color": C_BG}),
+})
+
+
+def credits_color(credits):
+    """Return the text color for a credit balance (green > 10, amber > 0, red otherwise)."""
+    return "#2ECC71" if credits > 10 else "#F39C12" if credits > 0 else "#E74C3C"
+
+
+# Pack options of every tab's root container inside content_frame
+_TAB_PACK_OPTIONS = MappingProxyType({"fill": "both", "expand": True, "padx": 40, "pady": 40})
+
+# Shared CTkFont objects keyed by (family, size, weight); see _font()
+_font_cache = {}
+
+
+def _font(size, weight="normal", family=None):
+    """
+    Get a shared CTkFont for the given style, creating it on first use.
+    
+    Each CTkFont allocates a Tk font, so widgets with the same style share one
+    object instead of creating a new font per widget on every tab build.
+    Must be called after the root window exists.
+    
+    Args:
+        size: Font size in points.
+        weight: "normal" or "bold".
+        family: Optional font family (theme default if None).
+        
+    Returns:
+        ctk.CTkFont: The shared font instance.
+    """
+    key = (family, size, weight)
+    font = _font_cache.get(key)
+    if font is None:
+        font = _font_cache[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+    return font
+
+
+# Sidebar navigation tabs (tab id, button label) in display order
+NAV_TABS = (
+    ("forge", "🔥 Forge"),
+    ("library", "📚 Library"),
+    ("account", "👤 Account"),
+    ("settings", "⚙️ Settings"),
+)
+
 # UI timing constants
 UI_RENDER_DELAY_MS = 200  # Delay before initial UI rendering to prevent RecursionError
 STEP_DELAY_SECONDS = 1.5  # Delay between simulated generation steps
 PACKAGING_DELAY_SECONDS = 1.0  # Delay for packaging simulation
-EMAIL_LOG_DELAY_MS = 500  # Delay before showing email log message
 COMPLETION_DELAY_MS = 1000  # Delay before completion
+LOG_FLUSH_INTERVAL_MS = 100  # Batch window for log console writes
+MAX_LOG_LINES = 2000  # Oldest console lines are trimmed beyond this
+PROGRESS_TICK_MS = 100  # Interval between progress label phase checks
+
+# Chapter kinds named in the simulated generation log, in display order
+_SAMPLE_CHAPTER_TYPES = (
+    "Introduction", "Core Concepts", "Methodology", "Implementation",
+    "Case Studies", "Best Practices", "Advanced Topics", "Future Directions",
+)
+
+# Progress label phases: _PROGRESS_MSGS[i] applies below _PROGRESS_THRESHOLDS[i]
+_PROGRESS_THRESHOLDS = (0.3, 0.6, 0.9)
+_PROGRESS_MSGS = (
+    "Analyzing your instruction...",
+    "Generating course structure...",
+    "Creating content...",
+    "Finalizing your course...",
+)
+
+# Basic email shape check for the activation form: local@domain.tld
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Characters stripped from course titles when building filenames
+# (\w keeps Unicode letters/digits, so Cyrillic titles survive)
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]+")
 
 # Path for the environment readiness flag file
 _READY_STATE_PATH = os.path.join(
@@ -93,6 +240,251 @@ def _mark_env_ready():
         pass
 
 
+def _valid_until_dt(record):
+    """
+    Return a license record's valid_until as an aware datetime, parsing it once.
+    
+    The parsed value is memoized on the record under "_valid_until_dt" so the
+    ban check, validation and display code share one parse.
+    
+    Args:
+        record: License record dict.
+        
+    Returns:
+        datetime or None: Expiry, or None for licenses without one.
+        
+    Raises:
+        ValueError: If valid_until is malformed (not memoized).
+    """
+    try:
+        return record["_valid_until_dt"]
+    except KeyError:
+        pass
+    valid_until = record.get("valid_until")
+    expiry = datetime.fromisoformat(valid_until.replace("Z", "+00:00")) if valid_until else None
+    record["_valid_until_dt"] = expiry
+    return expiry
+
+
+def _format_license_display(license_data):
+    """
+    Precompute the tier, expiry and email strings shown in the sidebar and Account tab.
+    
+    Args:
+        license_data: Validated license record, or None if not logged in.
+        
+    Returns:
+        tuple: (tier_text, tier_color, expiry_short, expiry_long, email_short)
+            where the expiry strings are "YYYY-MM-DD" and "Month DD, YYYY"
+            respectively and email_short fits the sidebar (25 chars max).
+    """
+    if not (license_data and isinstance(license_data, dict)):
+        return "UNKNOWN", C_ACCENT, "N/A", "N/A", "Not logged in"
+    
+    email = license_data.get('email', 'Unknown')
+    email_short = email if len(email) <= 25 else email[:22] + "..."
+    
+    tier_text = license_data.get('tier', 'standard').upper()
+    tier_color = TIER_COLORS.get(tier_text, C_ACCENT)
+    
+    expiry_short = expiry_long = "Lifetime"
+    try:
+        expiry_date = _valid_until_dt(license_data)
+        if expiry_date is not None:
+            expiry_short = expiry_date.strftime("%Y-%m-%d")
+            expiry_long = expiry_date.strftime("%B %d, %Y")
+    except Exception:
+        pass
+    
+    return tier_text, tier_color, expiry_short, expiry_long, email_short
+
+
+class LicenseRevoked(SystemExit):
+    """Raised to shut the app down when the remote license check fails.
+    
+    Subclasses SystemExit so Tk callbacks propagate it out of mainloop(),
+    where main() destroys the window cleanly and re-raises it. The message is
+    the SystemExit code, so the process prints it and exits with status 1.
+    """
+
+
+def _supabase_reachable(timeout: float = 1.0) -> bool:
+    """
+    Cheap TCP-level probe of the Supabase host.
+    
+    Lets offline launches skip the HTTPS client entirely instead of waiting
+    for the OS connect timeout (~20s on Windows) inside the Supabase call.
+    
+    Returns:
+        bool: True if port 443 on the Supabase host accepted a connection.
+    """
+    host = urlparse(SUPABASE_URL).hostname
+    if not host:
+        return False
+    try:
+        socket.create_connection((host, 443), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+
+# Shared Supabase client for the startup license checks (created on first use)
+_supabase_client = None
+_supabase_lock = threading.Lock()  # Ban check and license check race to create it
+
+# Seconds before a stalled Supabase request is abandoned
+SUPABASE_TIMEOUT_SECONDS = 5
+# Seconds to wait for a TCP/TLS connection (or a free pooled one) before giving up
+SUPABASE_CONNECT_TIMEOUT_SECONDS = 2
+
+
+def _prewarm_supabase():
+    """Import the Supabase package ahead of time so _get_supabase() finds it loaded."""
+    try:
+        importlib.import_module("supabase")
+    except ImportError:
+        # _get_supabase() raises on first use; the callers treat that as offline
+        pass
+
+
+def _get_supabase():
+    """
+    Get or create the Supabase client singleton.
+    
+    Reusing one client lets the ban check and the existing-license check share
+    a single warmed-up HTTP connection instead of each paying for TLS setup.
+    
+    Returns:
+        Client: Supabase client instance.
+    """
+    global _supabase_client
+    
+    if _supabase_client is None:
+        with _supabase_lock:
+            if _supabase_client is None:
+                # Lazy import: supabase is heavy, load only when needed
+                from supabase import create_client, ClientOptions
+                _supabase_client = create_client(
+                    SUPABASE_URL,
+                    SUPABASE_KEY,
+                    options=ClientOptions(
+                        postgrest_client_timeout=SUPABASE_TIMEOUT_SECONDS,
+                        storage_client_timeout=SUPABASE_TIMEOUT_SECONDS,
+                    ),
+                )
+                _bound_postgrest_session(_supabase_client)
+    
+    return _supabase_client
+
+
+def _bound_postgrest_session(client):
+    """
+    Swap the PostgREST httpx session for one with a small keep-alive pool and
+    a short connect timeout, so a flaky network fails fast to the offline path.
+    
+    Args:
+        client: Supabase client returned by create_client().
+    """
+    try:
+        import httpx
+        postgrest = client.postgrest
+        old_session = postgrest.session
+        postgrest.session = httpx.Client(
+            base_url=old_session.base_url,
+            headers=old_session.headers,
+            limits=httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=30),
+            timeout=httpx.Timeout(
+                SUPABASE_TIMEOUT_SECONDS,
+                connect=SUPABASE_CONNECT_TIMEOUT_SECONDS,
+                pool=SUPABASE_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+        old_session.close()
+    except (ImportError, AttributeError):
+        # Unexpected supabase/postgrest layout: keep the default session
+        pass
+
+
+# Single-flight device lookup shared by the two startup license checks
+_device_lookup = None
+_device_lookup_lock = threading.Lock()
+
+
+def _postgrest_quote(value):
+    """Double-quote a value for a PostgREST or() filter (escaping \\ and \")."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _lookup_device(hwid):
+    """
+    Fetch every license row bound to this device in one PostgREST request.
+    
+    The ban check matches on the 'hwid' column and the existing-license check
+    on the 'used_hwids' array. One or() filter covers both, and whichever check
+    asks first makes the request while the other waits for the same result,
+    so startup pays a single round-trip. Only callers that arrive while the
+    request is in flight share it; later calls (and retries after a network
+    error) make a fresh request.
+    
+    The query is fixed, so it is sent as a plain GET on the client's PostgREST
+    httpx session (already authenticated and pooled by _bound_postgrest_session)
+    rather than through the query builder.
+    
+    Args:
+        hwid: Current hardware ID.
+        
+    Returns:
+        list: Matching license rows (possibly empty).
+    """
+    global _device_lookup
+    
+    with _device_lookup_lock:
+        future, owner = _device_lookup, _device_lookup is None
+        if owner:
+            future = _device_lookup = Future()
+    
+    if owner:
+        try:
+            response = _get_supabase().postgrest.session.get("/licenses", params={
+                "select": LICENSE_COLUMNS,
+                "or": f"(hwid.eq.{_postgrest_quote(hwid)},"
+                      f"used_hwids.cs.{_postgrest_quote(json.dumps([hwid]))})",
+                "limit": "10",
+            })
+            response.raise_for_status()
+            future.set_result(response.json() or [])
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            with _device_lookup_lock:
+                _device_lookup = None
+    
+    return future.result()
+
+
+def _cache_license_check(hwid, record):
+    """
+    Remember a successful online license check for warm starts (license_cache).
+    
+    The row itself is stored only if it would sign this device in
+    (utils.license_covers_device); otherwise only the check is recorded, so the
+    ban check and activation cannot change which screen a warm start shows.
+    
+    Args:
+        hwid: Hardware ID the license was validated for.
+        record: The validated license row.
+    """
+    entry = {
+        "hwid": hwid,
+        "valid_until": record.get("valid_until"),
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if license_covers_device(record, hwid):
+        # Drop in-memory memos such as "_valid_until_dt" (not JSON-serializable)
+        entry["license"] = {k: v for k, v in record.items() if not k.startswith("_")}
+    license_cache.save(entry)
+
+
 def check_remote_ban(app_ref=None):
     """
     Check if the current HWID is authorized for license activation.
@@ -103,9 +495,12 @@ def check_remote_ban(app_ref=None):
     - Uses single 'hwid' column instead of 'used_hwids' array
     
     If banned, expired, or HWID mismatch, schedules error display and exit
-    on the main thread via app_ref.after() for thread safety.
+    on the main thread via app_ref.after() for thread safety. The exit is a
+    LicenseRevoked exception that main() catches around mainloop().
     Allows offline usage by catching connection errors.
     Uses .ready_state cache to skip dependency checks on subsequent launches.
+    Always asks Supabase when it is reachable; license_cache is never a
+    substitute for this query.
 
     Args:
         app_ref: Optional reference to the CTk app instance for thread-safe UI updates.
@@ -115,15 +510,13 @@ def check_remote_ban(app_ref=None):
         if app_ref is not None:
             app_ref.after(0, lambda: _do_exit(title, message))
         else:
-            messagebox.showerror(title, message)
-            sys.exit()
+            _do_exit(title, message)
 
     def _do_exit(title, message):
         messagebox.showerror(title, message)
-        sys.exit()
+        raise LicenseRevoked(message)
 
     try:
-        from supabase import create_client, Client
         # Get current hardware ID
         current_hwid = get_hwid()
         
@@ -132,20 +525,22 @@ def check_remote_ban(app_ref=None):
             _mark_env_ready()
             return
         
-        # Connect to Supabase
-        supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+        if not _supabase_reachable():
+            # Offline - allow usage without waiting for a connect timeout
+            return
         
-        # Query licenses table - search for license with this HWID
-        response = supabase.table("licenses").select("*").eq("hwid", current_hwid).execute()
+        # Search for the license bound to this HWID (shared startup lookup)
+        license_record = next(
+            (row for row in _lookup_device(current_hwid) if row.get("hwid") == current_hwid),
+            None,
+        )
         
         # If no license found with this HWID, allow app to continue
         # (First-time activation handled during login)
-        if not response.data or len(response.data) == 0:
+        if not license_record:
             _mark_env_ready()
             return
         
-        license_record = response.data[0]
-        
         # Check if license is banned
         if license_record.get("is_banned") is True:
             _show_error_and_exit(
@@ -155,29 +550,26 @@ def check_remote_ban(app_ref=None):
             return
         
         # Check if license has expired
-        valid_until = license_record.get("valid_until")
-        if valid_until:
-            try:
-                expiration_date = datetime.fromisoformat(valid_until.replace("Z", "+00:00"))
-                current_date = datetime.now(timezone.utc)
-                
-                if current_date > expiration_date:
-                    _show_error_and_exit(
-                        "Subscription Expired",
-                        "Your subscription for CourseSmith AI has expired. Please renew to continue."
-                    )
-                    return
-            except Exception as e:
-                # If date parsing fails, fail closed for security
-                print(f"Error: Invalid expiration date format: {e}")
-                _show_error_and_exit(
-                    "License Error",
-                    "Invalid license expiration date. Please contact support."
-                )
-                return
+        try:
+            expiration_date = _valid_until_dt(license_record)
+        except Exception as e:
+            # If date parsing fails, fail closed for security
+            print(f"Error: Invalid expiration date format: {e}")
+            _show_error_and_exit(
+                "License Error",
+                "Invalid license expiration date. Please contact support."
+            )
+            return
+        if expiration_date is not None and datetime.now(timezone.utc) > expiration_date:
+            _show_error_and_exit(
+                "Subscription Expired",
+                "Your subscription for CourseSmith AI has expired. Please renew to continue."
+            )
+            return
         
         # If we reach here, license is valid and HWID is authorized
         _mark_env_ready()
+        _cache_license_check(current_hwid, license_record)
         
     except Exception:
         # Allow offline usage - if connection fails, don't block the app
@@ -200,6 +592,25 @@ def validate_license_key(license_key: str, email: str) -> dict:
     return check_license(license_key, email, SUPABASE_URL, SUPABASE_KEY)
 
 
+@dataclass(slots=True)
+class UIState:
+    """
+    Plain session state of the main window, kept off the CTk instance __dict__.
+    
+    Attributes:
+        current_tab: Id of the visible sidebar tab (see NAV_TABS).
+        progress_animation_running: True while a generation run is animating.
+        license_valid: True once a license has been validated for this session.
+        license_data: The validated license record.
+        user_email: Licensed email from license_data, normalized at login.
+    """
+    current_tab: str = "forge"
+    progress_animation_running: bool = False
+    license_valid: bool = False
+    license_data: Optional[dict] = None
+    user_email: str = "user@example.com"
+
+
 class EnterpriseApp(ctk.CTk):
     """Enterprise UI with sidebar navigation and license authentication."""
     
@@ -207,13 +618,6 @@ class EnterpriseApp(ctk.CTk):
         """Initialize the enterprise application."""
         super().__init__()
         
-        # Set widget scaling for High-DPI support
-        # Default is 1.0. Adjust manually if needed for specific DPI requirements:
-        # - Set to 1.25 for 125% scaling
-        # - Set to 1.5 for 150% scaling
-        # This can be customized based on user preferences or system detection
-        ctk.set_widget_scaling(1.0)
-        
         # Configure window
         self.title("CourseSmith AI Enterprise")
         self.geometry("1200x800")
@@ -223,73 +627,264 @@ class EnterpriseApp(ctk.CTk):
         self._maximize_window()
         
         # Configure colors
-        self.configure(fg_color=COLORS['background'])
+        self.configure(fg_color=C_BG)
         
         # GLOBAL HOTKEY OVERRIDE - Bind keyboard shortcuts at root window level
         # This ensures shortcuts work regardless of widget focus issues
-        from utils import setup_global_window_shortcuts
         setup_global_window_shortcuts(self)
         
-        # State
-        self.current_tab = "forge"
-        self.progress_animation_running = False
-        self.license_valid = False  # Track license validation state
-        self.license_data = None  # Store validated license data
+        # State (session fields live on a slotted UIState; see the class docstring)
+        self.ui_state = UIState()
+        self._active_nav_btn = None  # Nav button of the current tab (set in _switch_tab)
+        self._last_progress_msg = None  # Phase text currently shown by the ticker
+        # Worker log lines and latest progress message awaiting display (see _ui_push)
+        self._progress_lock = threading.Lock()
+        self._pending_log_msgs = []
+        self._pending_progress_msg = None
+        self._progress_update_scheduled = False
+        self._license_display = _format_license_display(None)  # Cached tier/expiry strings
+        
+        # Widgets and results that exist only once their tab/run has been built;
+        # initialized here so later code can test them with "is not None"
+        self.instruction_textbox = None
+        self.log_console = None
+        self.account_credits_label = None
+        self.account_credits_value_label = None
+        self.account_tier_label = None
+        self.account_expiry_label = None
+        self.account_tier_badge = None
+        self.account_expiry_value_label = None
+        self.generated_course_data = None
+        self.generated_pdf_path = None
         
-        # Forge tab state persistence (preserve data when switching tabs)
-        self.saved_prompt_text = ""  # Store instruction textbox content
-        self.saved_log_text = ""  # Store log console content
+        # Credit balance shown in the sidebar and Account tab; labels follow it
+        # through _on_credits_change instead of being rebuilt
+        self.credits_var = ctk.IntVar(value=0)
+        self._shown_credits = None
+        self.credits_var.trace_add("write", self._on_credits_change)
+        
+        # Forge generation settings (bound to the page slider / format buttons)
+        self.page_count_var = ctk.IntVar(value=10)
+        self.selected_export_format = "PDF"
+        
+        # Page-count label debounce state (see _on_page_count_change)
+        self._page_label_after_id = None
+        self._shown_page_count = None
+        self._activation_container = None  # Root frame of the activation screen
+        
+        # Log lines waiting for the next batched write (see _log_message)
+        self._log_buf = io.StringIO()
+        self._log_flush_id = None
+        self._log_line_count = 0  # Lines currently in log_console
+        self._ts_cache = (None, "")  # (epoch second, "%H:%M:%S") of the last log line
         
         # Media files storage for attachments
         self.selected_media_files = []
         
-        # Initialize coursesmith_engine
+        # Single persistent worker for course generation (reused across runs,
+        # and serializes them so two runs never race on generated_course_data)
+        self._gen_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coursegen")
+        self._courses_dir = None  # Resolved and created on first course save
+        self._title_cache = {}  # Raw course title -> sanitized filename stem
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # Track whether the window is on screen so animations can idle while minimized
+        self._window_visible = True
+        self._paused_progress_value = None  # Ticker position saved while minimized
+        self.bind("<Map>", self._on_visibility_change, add="+")
+        self.bind("<Unmap>", self._on_visibility_change, add="+")
+        
+        # Minimal splash so the window paints immediately while the license
+        # check runs in the background (replaced in _on_license_result)
+        self._splash = ctk.CTkLabel(
+            self,
+            text="Checking license…",
+            font=_font(16),
+            text_color=C_TEXT_DIM
+        )
+        self._splash.place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Initialize coursesmith_engine and check for an activated license in
+        # parallel: the engine import overlaps the license network round-trip
         self.coursesmith_engine = None
-        self._init_coursesmith_engine()
+        self._license_from_cache = False  # Set by _check_existing_license on a warm start
+        startup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        self._engine_future = startup_pool.submit(self._init_coursesmith_engine)
+        license_future = startup_pool.submit(self._check_existing_license)
+        startup_pool.shutdown(wait=False)  # Workers exit once both tasks finish
+        
+        # Route the license result back to the Tk thread to pick the first screen
+        license_future.add_done_callback(
+            lambda future: self.after(0, self._on_license_result, future.result())
+        )
+    
+    def _on_close(self):
+        """Drop queued generation work and close the window."""
+        self._gen_executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+    
+    def _on_visibility_change(self, event):
+        """Record whether the main window is mapped (shown) or unmapped (minimized)."""
+        # Child widgets inherit the toplevel's bindings; only the window itself counts
+        if event.widget is not self:
+            return
+        self._window_visible = event.type == EventType.Map
+        
+        # Suspend the generation animation while hidden and resume it on restore
+        if not self.ui_state.progress_animation_running:
+            return
+        if self._window_visible:
+            self.progress_bar.start()
+            self._resume_progress_animation()
+        else:
+            self.progress_bar.stop()
+    
+    def _resume_progress_animation(self):
+        """Restart the progress label ticker if it paused while not on screen."""
+        if self._paused_progress_value is not None:
+            value, self._paused_progress_value = self._paused_progress_value, None
+            self._update_progress_animation(value)
+    
+    def _on_license_result(self, record):
+        """
+        Apply the startup license check and show the first screen (Tk thread).
         
-        # Check if license is already activated
-        if self._check_existing_license():
+        Args:
+            record: Validated license record for this device, or None.
+        """
+        self._splash.destroy()
+        
+        if record is not None:
             # License already validated, show main UI
+            self.ui_state.license_valid = True
+            self.ui_state.license_data = record
+            self.ui_state.user_email = record.get('email', self.ui_state.user_email)
+            self._license_display = _format_license_display(record)
             self._create_main_ui()
+            if self._license_from_cache:
+                # The cached row may be hours old; fetch live credits/tier
+                self._gen_executor.submit(self._fetch_live_license, record.get("license_key"))
         else:
             # Show login/activation screen
             self._create_activation_ui()
     
+    def _fetch_live_license(self, license_key):
+        """
+        Re-read this device's license row after a cache-served start (worker thread).
+        
+        Args:
+            license_key: Key of the license the UI was started with.
+        """
+        try:
+            current_hwid = get_hwid()
+            row = next(
+                (row for row in _lookup_device(current_hwid)
+                 if row.get("license_key") == license_key and license_covers_device(row, current_hwid)),
+                None,
+            )
+        except Exception as e:
+            # Offline or transient error: keep the session, as the ban check does
+            print(f"Could not refresh license details: {e}")
+            return
+        if row is not None and self._validate_license_record(row):
+            _cache_license_check(current_hwid, row)
+        else:
+            # Missing, unbound, banned or expired on the server
+            row = None
+        self.after(0, self._apply_live_license, row)
+    
+    def _apply_live_license(self, row):
+        """
+        Apply the live license row after a cache-served start (Tk thread).
+        
+        A missing or invalid row ends the session: the cache is cleared and
+        the app exits through LicenseRevoked, like the remote ban check.
+        Otherwise every credit, tier and expiry widget shows the live values.
+        
+        Args:
+            row: Current, validated license row, or None if there is none.
+        """
+        if row is None:
+            license_cache.clear()
+            message = ("The license for this device could not be confirmed. "
+                       "It may have been revoked, expired or removed. Please activate again.")
+            messagebox.showerror("License Not Found", message)
+            raise LicenseRevoked(message)
+        
+        if not (self.ui_state.license_data and isinstance(self.ui_state.license_data, dict)):
+            return
+        self.ui_state.license_data.update((k, v) for k, v in row.items() if not k.startswith("_"))
+        self.ui_state.license_data.pop("_valid_until_dt", None)
+        self._license_display = _format_license_display(self.ui_state.license_data)
+        self._refresh_license_labels()
+        try:
+            self._set_credits(int(row.get("credits", 0)))
+        except (ValueError, TypeError):
+            pass
+    
+    def _refresh_license_labels(self):
+        """Show the current tier/expiry strings in every built sidebar and Account widget."""
+        tier_text, tier_color, expiry_short, expiry_long, _ = self._license_display
+        updates = (
+            (self.account_tier_label, {"text": f"⭐ {tier_text}", "text_color": tier_color}),
+            (self.account_expiry_label, {"text": f"📅 Exp: {expiry_short}"}),
+            (self.account_tier_badge, {"text": f" {tier_text} ", "fg_color": tier_color}),
+            (self.account_expiry_value_label, {"text": expiry_long}),
+        )
+        for widget, options in updates:
+            if widget is not None and widget.winfo_exists():
+                widget.configure(**options)
+    
     def _check_existing_license(self):
-        """Check if a license is already activated on this device."""
+        """
+        Check if a license is already activated on this device.
+        Runs on the startup pool; _on_license_result applies the outcome.
+        
+        Returns:
+            dict or None: The validated license record, or None if there is none.
+        """
         try:
             current_hwid = get_hwid()
             if not current_hwid or current_hwid == "UNKNOWN_ID":
-                return False
+                return None
             
-            # Lazy import: supabase is heavy, load only when needed
-            from supabase import create_client, Client
-            # Connect to Supabase
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            # Validated recently on this device - reuse the cached record
+            # (credits/tier are refreshed in the background, see _on_license_result)
+            cached = license_cache.load()
+            if license_cache.is_fresh(cached, current_hwid) and cached.get("license"):
+                record = cached["license"]
+                if not (license_covers_device(record, current_hwid)
+                        and self._validate_license_record(record)):
+                    return None
+                self._license_from_cache = True
+                return record
             
-            # Query licenses table for this HWID
-            response = supabase.table("licenses").select("*").limit(100).execute()
+            if not _supabase_reachable():
+                # Offline - fall back to the activation screen right away
+                return None
             
-            # Find license that matches this HWID
-            for record in response.data if response.data else []:
-                used_hwids = parse_hwids_array(record.get("used_hwids"))
-                
-                if current_hwid in used_hwids:
-                    # Found matching license, validate it
-                    if self._validate_license_record(record):
-                        self.license_valid = True
-                        self.license_data = record
-                        return True
-                    else:
-                        # License found but invalid (expired/banned)
-                        return False
+            # The server matches this HWID against the used_hwids JSONB array
+            # (GIN-indexable containment, see .env.example) in the same request
+            # as the ban check; keep the rows that matched on that side
+            record = next(
+                (row for row in _lookup_device(current_hwid)
+                 if license_covers_device(row, current_hwid)),
+                None,
+            )
             
-            return False
+            if not record:
+                return None
+            
+            # Found matching license, validate it (expired/banned -> None)
+            if not self._validate_license_record(record):
+                return None
+            _cache_license_check(current_hwid, record)
+            return record
             
         except Exception as e:
             print(f"Error checking existing license: {e}")
             # On error, allow offline usage
-            return False
+            return None
     
     def _validate_license_record(self, record):
         """Validate a license record (check expiration and ban status)."""
@@ -297,21 +892,15 @@ class EnterpriseApp(ctk.CTk):
         if record.get("is_banned") is True:
             return False
         
-        # Check if license has expired
-        valid_until = record.get("valid_until")
-        if valid_until:
-            try:
-                expiration_date = datetime.fromisoformat(valid_until.replace("Z", "+00:00"))
-                current_date = datetime.now(timezone.utc)
-                
-                if current_date > expiration_date:
-                    return False
-            except Exception as e:
-                # If date parsing fails, fail closed for security
-                print(f"Warning: Failed to parse expiration date: {e}")
-                return False
+        # Check if license has expired (parsed once, reused for the expiry labels)
+        try:
+            expiration_date = _valid_until_dt(record)
+        except Exception as e:
+            # If date parsing fails, fail closed for security
+            print(f"Warning: Failed to parse expiration date: {e}")
+            return False
         
-        return True
+        return expiration_date is None or datetime.now(timezone.utc) <= expiration_date
     
     def _create_activation_ui(self):
         """Create the license activation screen with full screen background and centered login card."""
@@ -322,8 +911,9 @@ class EnterpriseApp(ctk.CTk):
         self.resizable(True, True)
         
         # Main container (full screen background)
-        container = ctk.CTkFrame(self, corner_radius=0, fg_color=COLORS['background'])
+        container = ctk.CTkFrame(self, corner_radius=0, fg_color=C_BG)
         container.pack(fill="both", expand=True)
+        self._activation_container = container  # Torn down as one unit after login
         
         # Center frame
         center_frame = ctk.CTkFrame(container, fg_color="transparent")
@@ -333,16 +923,16 @@ class EnterpriseApp(ctk.CTk):
         title_label = ctk.CTkLabel(
             center_frame,
             text="⚡ CourseSmith AI",
-            font=ctk.CTkFont(size=48, weight="bold"),
-            text_color=COLORS['accent']
+            font=_font(48, "bold"),
+            text_color=C_ACCENT
         )
         title_label.pack(pady=(0, 10))
         
         subtitle_label = ctk.CTkLabel(
             center_frame,
             text="Enterprise Edition",
-            font=ctk.CTkFont(size=20),
-            text_color=COLORS['text']
+            font=_font(20),
+            text_color=C_TEXT
         )
         subtitle_label.pack(pady=(0, 50))
         
@@ -350,7 +940,7 @@ class EnterpriseApp(ctk.CTk):
         activation_frame = ctk.CTkFrame(
             center_frame,
             corner_radius=15,
-            fg_color=COLORS['sidebar'],
+            fg_color=C_SIDEBAR,
             width=500,
             height=500
         )
@@ -361,8 +951,8 @@ class EnterpriseApp(ctk.CTk):
         activation_title = ctk.CTkLabel(
             activation_frame,
             text="License Activation Required",
-            font=ctk.CTkFont(size=22, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(22, "bold"),
+            text_color=C_TEXT
         )
         activation_title.pack(pady=(30, 10))
         
@@ -370,8 +960,8 @@ class EnterpriseApp(ctk.CTk):
         instructions = ctk.CTkLabel(
             activation_frame,
             text="Please enter your email and license key to activate CourseSmith AI",
-            font=ctk.CTkFont(size=13),
-            text_color=COLORS['text_dim']
+            font=_font(13),
+            text_color=C_TEXT_DIM
         )
         instructions.pack(pady=(0, 25))
         
@@ -379,19 +969,19 @@ class EnterpriseApp(ctk.CTk):
         email_label = ctk.CTkLabel(
             activation_frame,
             text="Email Address",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text']
+            font=_font(12),
+            text_color=C_TEXT
         )
         email_label.pack(pady=(0, 5), anchor="w", padx=50)
         
         self.activation_email_entry = ctk.CTkEntry(
             activation_frame,
             placeholder_text="your@email.com",
-            font=ctk.CTkFont(size=16),
+            font=_font(16),
             height=50,
             width=400,
-            fg_color=COLORS['background'],
-            border_color=COLORS['accent'],
+            fg_color=C_BG,
+            border_color=C_ACCENT,
             border_width=2
         )
         self.activation_email_entry.pack(pady=(0, 15))
@@ -401,19 +991,19 @@ class EnterpriseApp(ctk.CTk):
         key_label = ctk.CTkLabel(
             activation_frame,
             text="License Key",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text']
+            font=_font(12),
+            text_color=C_TEXT
         )
         key_label.pack(pady=(0, 5), anchor="w", padx=50)
         
         self.activation_entry = ctk.CTkEntry(
             activation_frame,
             placeholder_text="CS-XXXX-XXXX",
-            font=ctk.CTkFont(size=16),
+            font=_font(16),
             height=50,
             width=400,
-            fg_color=COLORS['background'],
-            border_color=COLORS['accent'],
+            fg_color=C_BG,
+            border_color=C_ACCENT,
             border_width=2
         )
         self.activation_entry.pack(pady=(0, 20))
@@ -430,24 +1020,24 @@ class EnterpriseApp(ctk.CTk):
         self.activation_status = ctk.CTkLabel(
             activation_frame,
             text="",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_dim']
+            font=_font(12),
+            text_color=C_TEXT_DIM
         )
         self.activation_status.pack(pady=(10, 10))
         
         # Activate button - Green button packed at bottom with side="bottom" and pady=40
         # Specs: height=60, width=400, color=#28a745
-        activate_btn = ctk.CTkButton(
+        self.activate_btn = ctk.CTkButton(
             activation_frame,
             text="🔓 Activate License",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=_font(16, "bold"),
             height=60,
             width=400,
             fg_color="#28a745",  # Green color for activate button
             hover_color="#218838",  # Darker green on hover
             command=self._on_activate
         )
-        activate_btn.pack(side="bottom", pady=40)
+        self.activate_btn.pack(side="bottom", pady=40)
     
     def _on_activate(self):
         """Handle license activation."""
@@ -459,7 +1049,7 @@ class EnterpriseApp(ctk.CTk):
             return
         
         # Basic email format validation
-        if '@' not in email or '.' not in email.split('@')[-1]:
+        if not _EMAIL_RE.match(email):
             self.activation_status.configure(text="Please enter a valid email address", text_color="red")
             return
         
@@ -467,22 +1057,48 @@ class EnterpriseApp(ctk.CTk):
             self.activation_status.configure(text="Please enter a license key", text_color="red")
             return
         
-        # Disable button during validation
-        self.activation_status.configure(text="Validating license...", text_color=COLORS['accent'])
-        self.update()
+        # Disable button during validation (also blocks re-entry via Return)
+        self.activate_btn.configure(state="disabled")
+        self.activation_status.configure(text="Validating license...", text_color=C_ACCENT)
         
-        # Validate license key with email
-        result = validate_license_key(license_key, email)
+        # Validate off the Tk thread; the result is applied in _finish_activate
+        threading.Thread(target=self._do_activate, args=(email, license_key), daemon=True).start()
+    
+    def _do_activate(self, email, license_key):
+        """
+        Validate the license key on a worker thread (network I/O).
         
+        Args:
+            email: Email entered on the activation screen.
+            license_key: License key entered on the activation screen.
+        """
+        try:
+            result = validate_license_key(license_key, email)
+            if result['valid'] and result['license_data']:
+                _cache_license_check(get_hwid(), result['license_data'])
+        except Exception as e:
+            result = {'valid': False, 'message': f"Activation failed: {e}", 'license_data': None}
+        self.after(0, self._finish_activate, result, email, license_key)
+    
+    def _finish_activate(self, result, email, license_key):
+        """
+        Apply an activation result on the Tk thread.
+        
+        Args:
+            result: Dict returned by validate_license_key.
+            email: Email entered on the activation screen.
+            license_key: License key entered on the activation screen.
+        """
         if result['valid']:
-            self.license_valid = True
-            self.license_data = result['license_data']
+            self.ui_state.license_valid = True
+            self.ui_state.license_data = result['license_data']
+            self.ui_state.user_email = (result['license_data'] or {}).get('email', self.ui_state.user_email)
+            self._license_display = _format_license_display(self.ui_state.license_data)
             
             # Set session data for ai_worker credit checking
-            tier = self.license_data.get('tier', 'standard') if self.license_data else 'standard'
-            # Generate a unique session token based on license data
-            import hashlib
-            session_token = hashlib.sha256(f"{email}:{license_key}:{datetime.now().isoformat()}".encode()).hexdigest()[:32]
+            tier = self.ui_state.license_data.get('tier', 'standard') if self.ui_state.license_data else 'standard'
+            # Random per-session token (only needs to be unique, not derived)
+            session_token = secrets.token_hex(16)
             set_session(
                 token=session_token,
                 email=email,
@@ -493,9 +1109,9 @@ class EnterpriseApp(ctk.CTk):
             # Show success message
             messagebox.showinfo("Success", result['message'])
             
-            # Clear activation UI and show main UI
-            for widget in self.winfo_children():
-                widget.destroy()
+            # Clear activation UI (everything lives in one container) and show main UI
+            self._activation_container.destroy()
+            self._activation_container = None
             
             # Restore window to main app size (1200x800) after login
             self.geometry("1200x800")
@@ -504,12 +1120,12 @@ class EnterpriseApp(ctk.CTk):
             
             self._create_main_ui()
         else:
+            self.activate_btn.configure(state="normal")
             self.activation_status.configure(text=result['message'], text_color="red")
     
     def _init_coursesmith_engine(self):
         """Initialize the CourseSmith Engine with the hardcoded primary API key."""
         try:
-            from coursesmith_engine import CourseSmithEngine
             # Use the hardcoded primary API key (no env var needed)
             self.coursesmith_engine = CourseSmithEngine()
         except Exception as e:
@@ -531,7 +1147,6 @@ class EnterpriseApp(ctk.CTk):
         Maximize the window (cross-platform compatible).
         Uses self.state('zoomed') for Windows, with fallbacks for other platforms.
         """
-        from tkinter import TclError
         try:
             # Try Windows-specific zoomed state
             self.state('zoomed')
@@ -554,7 +1169,7 @@ class EnterpriseApp(ctk.CTk):
         trigger geometry updates during initial widget creation.
         """
         # Main container with grid layout for responsive design
-        main_container = ctk.CTkFrame(self, corner_radius=0, fg_color=COLORS['background'])
+        main_container = ctk.CTkFrame(self, corner_radius=0, fg_color=C_BG)
         main_container.pack(fill="both", expand=True)
         
         # Configure grid: sidebar column (fixed), content column (expand)
@@ -567,7 +1182,7 @@ class EnterpriseApp(ctk.CTk):
             main_container,
             width=200,
             corner_radius=0,
-            fg_color=COLORS['sidebar']
+            fg_color=C_SIDEBAR
         )
         self.sidebar.grid(row=0, column=0, sticky="nsew")
         self.sidebar.grid_propagate(False)
@@ -576,18 +1191,17 @@ class EnterpriseApp(ctk.CTk):
         logo_label = ctk.CTkLabel(
             self.sidebar,
             text="⚡ CourseSmith",
-            font=ctk.CTkFont(size=20, weight="bold"),
-            text_color=COLORS['accent']
+            font=_font(20, "bold"),
+            text_color=C_ACCENT
         )
         logo_label.pack(pady=(30, 20))
         
-        # Navigation buttons
+        # Navigation buttons (one class-level binding drives every button's hover glow)
+        self.bind_class("NavButton", "<Enter>", self._on_nav_hover)
+        self.bind_class("NavButton", "<Leave>", self._on_nav_hover)
         self.nav_buttons = {}
-        
-        self.nav_buttons['forge'] = self._create_nav_button("🔥 Forge", "forge")
-        self.nav_buttons['library'] = self._create_nav_button("📚 Library", "library")
-        self.nav_buttons['account'] = self._create_nav_button("👤 Account", "account")
-        self.nav_buttons['settings'] = self._create_nav_button("⚙️ Settings", "settings")
+        for tab_id, label in NAV_TABS:
+            self.nav_buttons[tab_id] = self._create_nav_button(label, tab_id)
         
         # Spacer
         spacer = ctk.CTkFrame(self.sidebar, fg_color="transparent", height=20)
@@ -596,89 +1210,65 @@ class EnterpriseApp(ctk.CTk):
         # Account Info Frame at BOTTOM of sidebar - Display email and credits
         account_info_frame = ctk.CTkFrame(
             self.sidebar,
-            fg_color=COLORS['background'],
+            fg_color=C_BG,
             corner_radius=10
         )
         account_info_frame.pack(fill="x", padx=15, pady=(0, 10))
         
-        # Get user email and credits from license_data
-        user_email = "Not logged in"
-        credits_text = "0"
-        tier_text = "UNKNOWN"
-        expiry_text = "N/A"
-        
-        if self.license_data and isinstance(self.license_data, dict):
-            user_email = self.license_data.get('email', 'Unknown')
-            credits_text = str(self.license_data.get('credits', 0))
-            tier_text = self.license_data.get('tier', 'standard').upper()
-            valid_until = self.license_data.get('valid_until')
-            if valid_until:
-                try:
-                    expiry_date = datetime.fromisoformat(valid_until.replace("Z", "+00:00"))
-                    expiry_text = expiry_date.strftime("%Y-%m-%d")
-                except Exception:
-                    expiry_text = "Lifetime"
-            else:
-                expiry_text = "Lifetime"
+        # Email/tier/expiry were formatted at login
+        tier_text, tier_color, expiry_text, _, email_display = self._license_display
         
         # Store references for later updates
         self.account_credits_label = None
         self.account_tier_label = None
         
         # Email label (truncated if too long)
-        email_display = user_email if len(user_email) <= 25 else user_email[:22] + "..."
         email_label = ctk.CTkLabel(
             account_info_frame,
             text=f"📧 {email_display}",
-            font=ctk.CTkFont(size=10),
-            text_color=COLORS['text_dim']
+            font=_font(10),
+            text_color=C_TEXT_DIM
         )
         email_label.pack(pady=(8, 2), padx=10, anchor="w")
         
-        # Credits label with dynamic color
-        try:
-            credits_int = int(credits_text)
-        except (ValueError, TypeError):
-            credits_int = 0
-        credits_color = "#2ECC71" if credits_int > 10 else ("#F39C12" if credits_int > 0 else "#E74C3C")
+        # Credits label; text and color are kept current by _on_credits_change
         self.account_credits_label = ctk.CTkLabel(
             account_info_frame,
-            text=f"💳 Credits: {credits_text}",
-            font=ctk.CTkFont(size=11, weight="bold"),
-            text_color=credits_color
+            font=_font(11, "bold")
         )
         self.account_credits_label.pack(pady=(2, 2), padx=10, anchor="w")
+        credits = 0
+        if self.ui_state.license_data and isinstance(self.ui_state.license_data, dict):
+            try:
+                credits = int(self.ui_state.license_data.get('credits', 0))
+            except (ValueError, TypeError):
+                pass
+        self.credits_var.set(credits)
         
         # Tier label with tier-specific color
-        tier_colors = {
-            "PROFESSIONAL": "#FFD700",  # Gold
-            "EXTENDED": "#00CED1",       # Dark Cyan/Turquoise
-            "STANDARD": "#87CEEB"        # Sky Blue
-        }
-        tier_color = tier_colors.get(tier_text, COLORS['accent'])
         self.account_tier_label = ctk.CTkLabel(
             account_info_frame,
             text=f"⭐ {tier_text}",
-            font=ctk.CTkFont(size=11, weight="bold"),
+            font=_font(11, "bold"),
             text_color=tier_color
         )
         self.account_tier_label.pack(pady=(2, 2), padx=10, anchor="w")
         
         # Expiry label
-        expiry_label = ctk.CTkLabel(
+        self.account_expiry_label = ctk.CTkLabel(
             account_info_frame,
             text=f"📅 Exp: {expiry_text}",
-            font=ctk.CTkFont(size=10),
-            text_color=COLORS['text_dim']
+            font=_font(10),
+            text_color=C_TEXT_DIM
         )
-        expiry_label.pack(pady=(2, 8), padx=10, anchor="w")
+        self.account_expiry_label.pack(pady=(2, 8), padx=10, anchor="w")
         
         # Version label at bottom
         version_label = ctk.CTkLabel(
             self.sidebar,
             text="v2.0 Enterprise",
-            font=ctk.CTkFont(size=10),
-            text_color=COLORS['text_dim']
+            font=_font(10),
+            text_color=C_TEXT_DIM
         )
         version_label.pack(pady=(0, 20))
         
@@ -686,10 +1276,13 @@ class EnterpriseApp(ctk.CTk):
         self.content_frame = ctk.CTkFrame(
             main_container,
             corner_radius=0,
-            fg_color=COLORS['background']
+            fg_color=C_BG
         )
         self.content_frame.grid(row=0, column=1, sticky="nsew")
         
+        # Built tab containers by tab id (see _switch_tab)
+        self._tab_frames = {}
+        
         # Show default tab
         self._switch_tab("forge")
     
@@ -698,77 +1291,91 @@ class EnterpriseApp(ctk.CTk):
         btn = ctk.CTkButton(
             self.sidebar,
             text=text,
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=_font(14, "bold"),
             height=45,
             corner_radius=10,
             fg_color="transparent",
-            text_color=COLORS['text'],
-            hover_color=COLORS['accent'],
+            text_color=C_TEXT,
+            hover_color=C_ACCENT,
             anchor="w",
             command=lambda: self._switch_tab(tab_id)
         )
         btn.pack(fill="x", padx=15, pady=5)
         
-        # Bind hover events for glow effect
-        btn.bind("<Enter>", lambda e: self._on_button_hover(btn, True))
-        btn.bind("<Leave>", lambda e: self._on_button_hover(btn, False))
+        # Hover glow comes from the shared "NavButton" class binding (see _render_main_ui)
+        btn.bindtags(("NavButton",) + btn.bindtags())
+        btn._nav_state = "idle"  # Current _NAV_STYLES key (see _set_nav_state)
         
         return btn
     
+    def _on_nav_hover(self, event):
+        """Dispatch <Enter>/<Leave> on any nav button to the hover glow handler."""
+        self._on_button_hover(event.widget, event.type == EventType.Enter)
+    
     def _on_button_hover(self, button, is_entering):
         """Handle button hover for glow effect."""
         if is_entering:
-            button.configure(
-                text_color=COLORS['background'],
-                fg_color=COLORS['accent_hover']
-            )
+            self._set_nav_state(button, "hover")
+        elif button is self._active_nav_btn:
+            self._set_nav_state(button, "active")
         else:
-            # Check if this is the active tab
-            if button == self.nav_buttons.get(self.current_tab):
-                button.configure(
-                    text_color=COLORS['background'],
-                    fg_color=COLORS['accent']
-                )
-            else:
-                button.configure(
-                    text_color=COLORS['text'],
-                    fg_color="transparent"
-                )
+            self._set_nav_state(button, "idle")
+    
+    def _set_nav_state(self, button, state):
+        """
+        Restyle a nav button, skipping the Tcl round-trip if nothing changes.
+        
+        Enter/Leave also fire while the pointer crosses the button's own inner
+        canvas and label, so most hover events are no-ops.
+        
+        Args:
+            button: Nav button created by _create_nav_button.
+            state: Key of _NAV_STYLES ("idle", "hover" or "active").
+        """
+        if button._nav_state != state:
+            button._nav_state = state
+            button.configure(**_NAV_STYLES[state])
     
     def _switch_tab(self, tab_id):
         """Switch to a different tab."""
-        # Save Forge tab state before switching away
-        if self.current_tab == "forge":
-            self._save_forge_state()
+        # Hide the current tab without destroying it (its widgets keep their state)
+        current_frame = self._tab_frames.get(self.ui_state.current_tab)
+        if current_frame is not None:
+            current_frame.pack_forget()
         
-        self.current_tab = tab_id
+        self.ui_state.current_tab = tab_id
+        self._active_nav_btn = self.nav_buttons.get(tab_id)
         
         # Update button states
         for btn_id, btn in self.nav_buttons.items():
-            if btn_id == tab_id:
-                btn.configure(
-                    fg_color=COLORS['accent'],
-                    text_color=COLORS['background']
-                )
-            else:
-                btn.configure(
-                    fg_color="transparent",
-                    text_color=COLORS['text']
-                )
+            self._set_nav_state(btn, "active" if btn_id == tab_id else "idle")
         
-        # Clear content frame
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Show the tab, building it on first visit; built tabs keep their widgets
+        frame = self._tab_frames.get(tab_id)
+        if frame is None:
+            self._tab_frames[tab_id] = self._build_tab(tab_id)
+        else:
+            frame.pack(**_TAB_PACK_OPTIONS)
+            if tab_id == "forge":
+                self._resume_progress_animation()
+    
+    def _build_tab(self, tab_id):
+        """
+        Build a tab's content inside content_frame.
         
-        # Show appropriate content
-        if tab_id == "forge":
-            self._create_forge_tab()
-        elif tab_id == "library":
-            self._create_library_tab()
-        elif tab_id == "account":
-            self._create_account_tab()
-        elif tab_id == "settings":
-            self._create_settings_tab()
+        Args:
+            tab_id: Id of the tab to build (see NAV_TABS).
+            
+        Returns:
+            The tab's root container, already packed.
+        """
+        builders = {
+            "forge": self._create_forge_tab,
+            "library": self._create_library_tab,
+            "account": self._create_account_tab,
+            "settings": self._create_settings_tab,
+        }
+        return builders[tab_id]()
     
     def _create_forge_tab(self):
         """Create the Forge tab - main course generation interface."""
@@ -776,17 +1383,17 @@ class EnterpriseApp(ctk.CTk):
         container = ctk.CTkScrollableFrame(
             self.content_frame,
             fg_color="transparent",
-            scrollbar_button_color=COLORS['accent'],
-            scrollbar_button_hover_color=COLORS['accent_hover']
+            scrollbar_button_color=C_ACCENT,
+            scrollbar_button_hover_color=C_ACCENT_HOVER
         )
-        container.pack(fill="both", expand=True, padx=40, pady=40)
+        container.pack(**_TAB_PACK_OPTIONS)
         
         # Title
         title_label = ctk.CTkLabel(
             container,
             text="Forge Your Course",
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(32, "bold"),
+            text_color=C_TEXT
         )
         title_label.pack(anchor="w", pady=(0, 10))
         
@@ -794,66 +1401,56 @@ class EnterpriseApp(ctk.CTk):
         subtitle_label = ctk.CTkLabel(
             container,
             text="Enter your master instruction below to generate an educational course",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim']
+            font=_font(14),
+            text_color=C_TEXT_DIM
         )
         subtitle_label.pack(anchor="w", pady=(0, 30))
         
         # Input frame
-        input_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        input_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         input_frame.pack(fill="both", expand=True, pady=(0, 20))
         
         # Input label
         input_label = ctk.CTkLabel(
             input_frame,
             text="Master Instruction",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(16, "bold"),
+            text_color=C_TEXT
         )
         input_label.pack(anchor="w", padx=25, pady=(25, 10))
         
         # Large text input
         self.instruction_textbox = ctk.CTkTextbox(
             input_frame,
-            font=ctk.CTkFont(size=14),
+            font=_font(14),
             wrap="word",
             height=300,
-            fg_color=COLORS['background'],
-            border_color=COLORS['accent'],
+            fg_color=C_BG,
+            border_color=C_ACCENT,
             border_width=2
         )
         self.instruction_textbox.pack(fill="both", expand=True, padx=25, pady=(0, 25))
         
-        # Restore saved prompt text if available
-        if self.saved_prompt_text:
-            self.instruction_textbox.insert("1.0", self.saved_prompt_text)
-        
-        # Bind KeyRelease event to auto-save prompt text
-        self.instruction_textbox.bind("<KeyRelease>", self._on_prompt_change)
-        
         # Add clipboard support (includes all shortcuts: Ctrl+C/V/A)
-        from utils import add_context_menu
         add_context_menu(self.instruction_textbox)
         
         # Settings Panel Frame (above Generate button)
-        settings_panel = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        settings_panel = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         settings_panel.pack(fill="x", pady=(0, 20))
         
         # Page Count slider with dynamic label
         page_count_frame = ctk.CTkFrame(settings_panel, fg_color="transparent")
         page_count_frame.pack(fill="x", padx=25, pady=20)
         
-        # Initialize page count variable (default: 10 pages)
-        self.page_count_var = ctk.IntVar(value=10)
-        
         # Dynamic label that updates with slider
         self.page_count_label = ctk.CTkLabel(
             page_count_frame,
             text="Target: 10 Pages",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(14, "bold"),
+            text_color=C_TEXT
         )
         self.page_count_label.pack(anchor="w", pady=(0, 10))
+        self._shown_page_count = 10
         
         # Page Count slider (Range: 5 to 100 pages)
         self.page_count_slider = ctk.CTkSlider(
@@ -864,9 +1461,9 @@ class EnterpriseApp(ctk.CTk):
             variable=self.page_count_var,
             width=400,
             height=20,
-            progress_color=COLORS['accent'],
-            button_color=COLORS['accent'],
-            button_hover_color=COLORS['accent_hover'],
+            progress_color=C_ACCENT,
+            button_color=C_ACCENT,
+            button_hover_color=C_ACCENT_HOVER,
             command=self._on_page_count_change
         )
         self.page_count_slider.pack(anchor="w")
@@ -879,7 +1476,7 @@ class EnterpriseApp(ctk.CTk):
         self.media_import_btn = ctk.CTkButton(
             media_frame,
             text="📂 Import Images/Audio/Video",
-            font=ctk.CTkFont(size=14),
+            font=_font(14),
             height=40,
             corner_radius=10,
             fg_color="#3A7CA5",  # Blue color
@@ -892,20 +1489,20 @@ class EnterpriseApp(ctk.CTk):
         self.media_label = ctk.CTkLabel(
             media_frame,
             text="No media selected",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_dim']
+            font=_font(12),
+            text_color=C_TEXT_DIM
         )
         self.media_label.pack(side="left", anchor="w")
         
         # ===== EXPORT FORMAT SELECTION =====
-        format_section = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        format_section = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         format_section.pack(fill="x", pady=(0, 20))
         
         format_label = ctk.CTkLabel(
             format_section,
             text="Select Output Format:",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(14, "bold"),
+            text_color=C_TEXT
         )
         format_label.pack(anchor="w", padx=20, pady=(15, 10))
         
@@ -915,7 +1512,6 @@ class EnterpriseApp(ctk.CTk):
         
         # Store format buttons for selection state management
         self.format_buttons = {}
-        self.selected_export_format = "PDF"  # Default format
         
         # All export formats: PDF, DOCX, HTML, EPUB, Markdown
         export_formats = [
@@ -933,7 +1529,7 @@ class EnterpriseApp(ctk.CTk):
             btn = ctk.CTkButton(
                 format_buttons_frame,
                 text=f"{fmt['icon']} {fmt['name']}",
-                font=ctk.CTkFont(size=13, weight="bold" if is_default else "normal"),
+                font=_font(13, "bold" if is_default else "normal"),
                 width=90,
                 height=40,
                 corner_radius=8,
@@ -954,11 +1550,11 @@ class EnterpriseApp(ctk.CTk):
         self.generate_btn = ctk.CTkButton(
             action_frame,
             text="⚡ Generate Course",
-            font=ctk.CTkFont(size=16, weight="bold"),
+            font=_font(16, "bold"),
             height=50,
             corner_radius=10,
-            fg_color=COLORS['accent'],
-            hover_color=COLORS['accent_hover'],
+            fg_color=C_ACCENT,
+            hover_color=C_ACCENT_HOVER,
             command=self._start_generation
         )
         self.generate_btn.pack(side="left", fill="x", expand=True, padx=(0, 10))
@@ -967,55 +1563,49 @@ class EnterpriseApp(ctk.CTk):
         clear_btn = ctk.CTkButton(
             action_frame,
             text="Clear",
-            font=ctk.CTkFont(size=14),
+            font=_font(14),
             height=50,
             corner_radius=10,
-            fg_color=COLORS['sidebar'],
-            hover_color=COLORS['accent'],
+            fg_color=C_SIDEBAR,
+            hover_color=C_ACCENT,
             command=self._clear_instruction
         )
         clear_btn.pack(side="left", padx=(0, 0))
         
         # Logging console frame
-        log_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        log_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         log_frame.pack(fill="both", expand=True, pady=(0, 20))
         
         log_label = ctk.CTkLabel(
             log_frame,
             text="Generation Log",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(16, "bold"),
+            text_color=C_TEXT
         )
         log_label.pack(anchor="w", padx=25, pady=(25, 10))
         
         # Logging console text widget - Matrix-style (Black bg/Green text)
         self.log_console = ctk.CTkTextbox(
             log_frame,
-            font=ctk.CTkFont(family="Consolas", size=12),
+            font=_font(12, family="Consolas"),
             wrap="word",
             height=200,
             fg_color="#000000",  # Matrix-style black background
             text_color="#00FF00",  # Matrix-style green text
-            border_color=COLORS['accent'],
+            border_color=C_ACCENT,
             border_width=2,
             state="disabled"  # Read-only
         )
         self.log_console.pack(fill="both", expand=True, padx=25, pady=(0, 25))
         
-        # Restore saved log text if available
-        if self.saved_log_text:
-            self.log_console.configure(state="normal")
-            self.log_console.insert("1.0", self.saved_log_text)
-            self.log_console.configure(state="disabled")
-        
         # Progress frame (initially hidden)
-        self.progress_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        self.progress_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         
         self.progress_label = ctk.CTkLabel(
             self.progress_frame,
             text="Generating your course...",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text']
+            font=_font(14),
+            text_color=C_TEXT
         )
         self.progress_label.pack(pady=(20, 10))
         
@@ -1024,34 +1614,12 @@ class EnterpriseApp(ctk.CTk):
             width=400,
             height=20,
             corner_radius=10,
-            progress_color=COLORS['accent']
+            progress_color=C_ACCENT
         )
         self.progress_bar.pack(pady=(0, 20))
         self.progress_bar.set(0)
-    
-    def _save_forge_state(self):
-        """Save Forge tab state (prompt and log) for persistence."""
-        try:
-            # Save prompt text
-            if hasattr(self, 'instruction_textbox') and self.instruction_textbox.winfo_exists():
-                self.saved_prompt_text = self.instruction_textbox.get("1.0", "end-1c")
-            
-            # Save log text
-            if hasattr(self, 'log_console') and self.log_console.winfo_exists():
-                self.log_console.configure(state="normal")
-                self.saved_log_text = self.log_console.get("1.0", "end-1c")
-                self.log_console.configure(state="disabled")
-        except Exception:
-            # Widget may have been destroyed
-            pass
-    
-    def _on_prompt_change(self, event=None):
-        """Handle prompt text changes - auto-save to state variable."""
-        try:
-            if hasattr(self, 'instruction_textbox') and self.instruction_textbox.winfo_exists():
-                self.saved_prompt_text = self.instruction_textbox.get("1.0", "end-1c")
-        except Exception:
-            pass
+        
+        return container
     
     def _select_format(self, selected_format):
         """
@@ -1079,7 +1647,7 @@ class EnterpriseApp(ctk.CTk):
                 fg_color=colors["fg"],
                 hover_color=colors["hover"],
                 border_color=colors["border"],
-                font=ctk.CTkFont(size=13, weight="bold" if is_selected else "normal"),
+                font=_font(13, "bold" if is_selected else "normal"),
                 text=f"{icon} {format_name}"
             )
         
@@ -1089,61 +1657,39 @@ class EnterpriseApp(ctk.CTk):
     def _create_account_tab(self):
         """Create the Account tab - display user info, credits, and license details."""
         container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        container.pack(fill="both", expand=True, padx=40, pady=40)
+        container.pack(**_TAB_PACK_OPTIONS)
         
         title_label = ctk.CTkLabel(
             container,
             text="👤 Account",
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(32, "bold"),
+            text_color=C_TEXT
         )
         title_label.pack(anchor="w", pady=(0, 10))
         
         subtitle_label = ctk.CTkLabel(
             container,
             text="Your license information and account details",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim']
+            font=_font(14),
+            text_color=C_TEXT_DIM
         )
         subtitle_label.pack(anchor="w", pady=(0, 30))
         
         # Account info frame
-        account_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        account_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         account_frame.pack(fill="x", pady=(0, 20))
         
         # Get user data from license_data
         user_email = "Not available"
-        credits_count = 0
-        tier_text = "UNKNOWN"
-        expiry_text = "N/A"
+        tier_text, tier_color, _, expiry_text, _ = self._license_display
         license_key_display = "Not available"
         
-        if self.license_data and isinstance(self.license_data, dict):
-            user_email = self.license_data.get('email', 'Unknown')
-            credits_count = self.license_data.get('credits', 0)
-            tier_text = self.license_data.get('tier', 'standard').upper()
-            license_key = self.license_data.get('license_key', '')
+        if self.ui_state.license_data and isinstance(self.ui_state.license_data, dict):
+            user_email = self.ui_state.license_data.get('email', 'Unknown')
+            license_key = self.ui_state.license_data.get('license_key', '')
             if license_key:
                 # Truncate license key for display
                 license_key_display = f"{license_key[:12]}...{license_key[-6:]}" if len(license_key) > 20 else license_key
-            
-            valid_until = self.license_data.get('valid_until')
-            if valid_until:
-                try:
-                    expiry_date = datetime.fromisoformat(valid_until.replace("Z", "+00:00"))
-                    expiry_text = expiry_date.strftime("%B %d, %Y")
-                except Exception:
-                    expiry_text = "Lifetime"
-            else:
-                expiry_text = "Lifetime"
-        
-        # Tier colors
-        tier_colors = {
-            "PROFESSIONAL": "#FFD700",  # Gold
-            "EXTENDED": "#00CED1",       # Dark Cyan/Turquoise
-            "STANDARD": "#87CEEB"        # Sky Blue
-        }
-        tier_color = tier_colors.get(tier_text, COLORS['accent'])
         
         # Account details section
         details_frame = ctk.CTkFrame(account_frame, fg_color="transparent")
@@ -1156,16 +1702,16 @@ class EnterpriseApp(ctk.CTk):
         ctk.CTkLabel(
             email_row,
             text="📧 Email:",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim'],
+            font=_font(14),
+            text_color=C_TEXT_DIM,
             width=120
         ).pack(side="left")
         
         ctk.CTkLabel(
             email_row,
             text=user_email,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(14, "bold"),
+            text_color=C_TEXT
         ).pack(side="left", padx=(10, 0))
         
         # Row 2: License Tier
@@ -1175,20 +1721,20 @@ class EnterpriseApp(ctk.CTk):
         ctk.CTkLabel(
             tier_row,
             text="⭐ License Tier:",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim'],
+            font=_font(14),
+            text_color=C_TEXT_DIM,
             width=120
         ).pack(side="left")
         
-        tier_badge = ctk.CTkLabel(
+        self.account_tier_badge = ctk.CTkLabel(
             tier_row,
             text=f" {tier_text} ",
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=COLORS['background'],
+            font=_font(14, "bold"),
+            text_color=C_BG,
             fg_color=tier_color,
             corner_radius=5
         )
-        tier_badge.pack(side="left", padx=(10, 0))
+        self.account_tier_badge.pack(side="left", padx=(10, 0))
         
         # Row 3: Credits with large display
         credits_row = ctk.CTkFrame(details_frame, fg_color="transparent")
@@ -1197,19 +1743,19 @@ class EnterpriseApp(ctk.CTk):
         ctk.CTkLabel(
             credits_row,
             text="💳 Credits:",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim'],
+            font=_font(14),
+            text_color=C_TEXT_DIM,
             width=120
         ).pack(side="left")
         
-        # Credits color based on amount (using better contrast colors)
-        credits_color = "#2ECC71" if credits_count > 10 else ("#F39C12" if credits_count > 0 else "#E74C3C")
-        ctk.CTkLabel(
+        # Bound to credits_var; its color follows the balance via _on_credits_change
+        self.account_credits_value_label = ctk.CTkLabel(
             credits_row,
-            text=str(credits_count),
-            font=ctk.CTkFont(size=24, weight="bold"),
-            text_color=credits_color
-        ).pack(side="left", padx=(10, 0))
+            textvariable=self.credits_var,
+            font=_font(24, "bold"),
+            text_color=credits_color(self.credits_var.get())
+        )
+        self.account_credits_value_label.pack(side="left", padx=(10, 0))
         
         # Row 4: Expiration
         expiry_row = ctk.CTkFrame(details_frame, fg_color="transparent")
@@ -1218,17 +1764,18 @@ class EnterpriseApp(ctk.CTk):
         ctk.CTkLabel(
             expiry_row,
             text="📅 Expires:",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim'],
+            font=_font(14),
+            text_color=C_TEXT_DIM,
             width=120
         ).pack(side="left")
         
-        ctk.CTkLabel(
+        self.account_expiry_value_label = ctk.CTkLabel(
             expiry_row,
             text=expiry_text,
-            font=ctk.CTkFont(size=14, weight="bold"),
-            text_color=COLORS['text']
-        ).pack(side="left", padx=(10, 0))
+            font=_font(14, "bold"),
+            text_color=C_TEXT
+        )
+        self.account_expiry_value_label.pack(side="left", padx=(10, 0))
         
         # Row 5: License Key (partially hidden)
         key_row = ctk.CTkFrame(details_frame, fg_color="transparent")
@@ -1237,16 +1784,16 @@ class EnterpriseApp(ctk.CTk):
         ctk.CTkLabel(
             key_row,
             text="🔑 License Key:",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim'],
+            font=_font(14),
+            text_color=C_TEXT_DIM,
             width=120
         ).pack(side="left")
         
         ctk.CTkLabel(
             key_row,
             text=license_key_display,
-            font=ctk.CTkFont(size=12, family="Courier New"),
-            text_color=COLORS['text_dim']
+            font=_font(12, family="Courier New"),
+            text_color=C_TEXT_DIM
         ).pack(side="left", padx=(10, 0))
         
         # Refresh Credits Button
@@ -1256,14 +1803,16 @@ class EnterpriseApp(ctk.CTk):
         refresh_btn = ctk.CTkButton(
             refresh_frame,
             text="🔄 Refresh Credits",
-            font=ctk.CTkFont(size=14, weight="bold"),
+            font=_font(14, "bold"),
             height=45,
             corner_radius=10,
-            fg_color=COLORS['accent'],
-            hover_color=COLORS['accent_hover'],
+            fg_color=C_ACCENT,
+            hover_color=C_ACCENT_HOVER,
             command=self._refresh_credits
         )
         refresh_btn.pack(anchor="w")
+        
+        return container
     
     def _refresh_credits(self):
         """Refresh credits count from database and update UI."""
@@ -1274,20 +1823,8 @@ class EnterpriseApp(ctk.CTk):
             # Check if we got valid credit info (credits could be 0 or positive)
             credits = credit_status.get('credits', 0)
             if credits >= 0:
-                # Update license_data
-                if self.license_data and isinstance(self.license_data, dict):
-                    self.license_data['credits'] = credits
-                
-                # Update sidebar credits label if it exists
-                if hasattr(self, 'account_credits_label') and self.account_credits_label:
-                    credits_color = "#2ECC71" if credits > 10 else ("#F39C12" if credits > 0 else "#E74C3C")
-                    self.account_credits_label.configure(
-                        text=f"💳 Credits: {credits}",
-                        text_color=credits_color
-                    )
-                
-                # Refresh the account tab to show updated info
-                self._switch_tab("account")
+                # Sidebar and Account tab labels follow credits_var
+                self._set_credits(credits)
                 
                 messagebox.showinfo("Credits Updated", f"You have {credits} credits remaining.")
             else:
@@ -1295,62 +1832,92 @@ class EnterpriseApp(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Error", f"Could not refresh credits: {str(e)}")
     
+    def _set_credits(self, credits):
+        """
+        Record a fresh credit balance from Supabase and publish it to the UI.
+        
+        Args:
+            credits: Remaining credits for the current license.
+        """
+        if self.ui_state.license_data and isinstance(self.ui_state.license_data, dict):
+            self.ui_state.license_data['credits'] = credits
+        self.credits_var.set(credits)
+    
+    def _on_credit_deducted(self, amount=1):
+        """Reflect a successful server-side credit deduction in the shown balance."""
+        self._set_credits(max(0, self.credits_var.get() - amount))
+    
+    def _on_credits_change(self, *_):
+        """credits_var trace: restyle the credit labels that currently exist."""
+        credits = self.credits_var.get()
+        if credits == self._shown_credits:
+            return
+        self._shown_credits = credits
+        color = credits_color(credits)
+        if self.account_credits_label is not None:
+            self.account_credits_label.configure(text=f"💳 Credits: {credits}", text_color=color)
+        value_label = self.account_credits_value_label
+        if value_label is not None and value_label.winfo_exists():
+            value_label.configure(text_color=color)
+    
     def _create_library_tab(self):
         """Create the Library tab."""
         container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        container.pack(fill="both", expand=True, padx=40, pady=40)
+        container.pack(**_TAB_PACK_OPTIONS)
         
         title_label = ctk.CTkLabel(
             container,
             text="Course Library",
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(32, "bold"),
+            text_color=C_TEXT
         )
         title_label.pack(anchor="w", pady=(0, 10))
         
         subtitle_label = ctk.CTkLabel(
             container,
             text="View and manage your generated courses",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim']
+            font=_font(14),
+            text_color=C_TEXT_DIM
         )
         subtitle_label.pack(anchor="w", pady=(0, 30))
         
         # Placeholder for library content
-        placeholder_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        placeholder_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         placeholder_frame.pack(fill="both", expand=True)
         
         placeholder_label = ctk.CTkLabel(
             placeholder_frame,
             text="📚 Your course library will appear here",
-            font=ctk.CTkFont(size=16),
-            text_color=COLORS['text_dim']
+            font=_font(16),
+            text_color=C_TEXT_DIM
         )
         placeholder_label.pack(expand=True)
+        
+        return container
     
     def _create_settings_tab(self):
         """Create the Settings tab."""
         container = ctk.CTkFrame(self.content_frame, fg_color="transparent")
-        container.pack(fill="both", expand=True, padx=40, pady=40)
+        container.pack(**_TAB_PACK_OPTIONS)
         
         title_label = ctk.CTkLabel(
             container,
             text="Settings",
-            font=ctk.CTkFont(size=32, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(32, "bold"),
+            text_color=C_TEXT
         )
         title_label.pack(anchor="w", pady=(0, 10))
         
         subtitle_label = ctk.CTkLabel(
             container,
             text="Configure your CourseSmith preferences",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_dim']
+            font=_font(14),
+            text_color=C_TEXT_DIM
         )
         subtitle_label.pack(anchor="w", pady=(0, 30))
         
         # Settings frame
-        settings_frame = ctk.CTkFrame(container, fg_color=COLORS['sidebar'], corner_radius=15)
+        settings_frame = ctk.CTkFrame(container, fg_color=C_SIDEBAR, corner_radius=15)
         settings_frame.pack(fill="both", expand=True, pady=(0, 20))
         
         # Info section (API key is now managed internally)
@@ -1360,38 +1927,52 @@ class EnterpriseApp(ctk.CTk):
         info_label = ctk.CTkLabel(
             info_frame,
             text="ℹ️ API Configuration",
-            font=ctk.CTkFont(size=18, weight="bold"),
-            text_color=COLORS['text']
+            font=_font(18, "bold"),
+            text_color=C_TEXT
         )
         info_label.pack(anchor="w", pady=(0, 10))
         
         info_text = ctk.CTkLabel(
             info_frame,
             text="API access is managed automatically. Credits are deducted from your license when generating courses.",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_dim'],
+            font=_font(12),
+            text_color=C_TEXT_DIM,
             wraplength=500,
             justify="left"
         )
         info_text.pack(anchor="w", pady=(0, 15))
+        
+        return container
     
     def _on_page_count_change(self, value):
         """
         Handle page count slider change - update the dynamic label.
+        Drags fire this on every step, so label updates are coalesced to one per frame.
         
         Args:
             value: The new slider value (float, will be converted to int)
         """
-        page_count = int(value)
-        self.page_count_label.configure(text=f"Target: {page_count} Pages")
+        if self._page_label_after_id is not None:
+            self.after_cancel(self._page_label_after_id)
+        self._page_label_after_id = self.after(16, self._apply_page_count_label, int(value))
+    
+    def _apply_page_count_label(self, page_count):
+        """
+        Show the debounced page count, skipping the reconfigure if it is unchanged.
+        
+        Args:
+            page_count: The slider value to display.
+        """
+        self._page_label_after_id = None
+        if page_count != self._shown_page_count:
+            self._shown_page_count = page_count
+            self.page_count_label.configure(text=f"Target: {page_count} Pages")
     
     def _open_media_dialog(self):
         """
         Open file dialog to select media files (images, audio, video).
         Updates self.selected_media_files and the media_label.
         """
-        from tkinter import filedialog
-        
         # Define file types for images, audio, and video
         filetypes = [
             ("All Media Files", "*.png *.jpg *.jpeg *.gif *.bmp *.webp *.mp3 *.wav *.ogg *.m4a *.flac *.mp4 *.avi *.mov *.mkv *.webm"),
@@ -1415,7 +1996,7 @@ class EnterpriseApp(ctk.CTk):
             file_count = len(self.selected_media_files)
             self.media_label.configure(
                 text=f"Attached: {file_count} file{'s' if file_count != 1 else ''}",
-                text_color=COLORS['text']
+                text_color=C_TEXT
             )
         # If no files selected, keep the current state (don't clear existing selection)
     
@@ -1426,16 +2007,38 @@ class EnterpriseApp(ctk.CTk):
         Args:
             message: The message to log
         """
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
+        # Lines logged within the same second reuse the formatted timestamp
+        now = int(time.time())
+        if now != self._ts_cache[0]:
+            self._ts_cache = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+        self._log_buf.write(f"[{self._ts_cache[1]}] {message}\n")
+        
+        # Lines arriving within LOG_FLUSH_INTERVAL_MS share one console write
+        if self._log_flush_id is None:
+            self._log_flush_id = self.after(LOG_FLUSH_INTERVAL_MS, self._flush_logs)
+    
+    def _flush_logs(self):
+        """Write all queued log lines to the logging console in one batch."""
+        if self._log_flush_id is not None:
+            self.after_cancel(self._log_flush_id)
+            self._log_flush_id = None
+        text = self._log_buf.getvalue()
+        if not text:
+            return
+        self._log_buf = io.StringIO()
         
-        # Update log console on main thread
         self.log_console.configure(state="normal")
-        self.log_console.insert("end", log_entry)
+        self.log_console.insert("end", text)
+        # Drop only the oldest lines once over the cap (no clear + reinsert)
+        self._log_line_count += text.count("\n")
+        excess = self._log_line_count - MAX_LOG_LINES
+        if excess > 0:
+            self.log_console.delete("1.0", f"{excess + 1}.0")
+            self._log_line_count = MAX_LOG_LINES
         self.log_console.see("end")  # Scroll to bottom
         self.log_console.configure(state="disabled")
     
-    def _generate_pdf_file(self, course_data: dict, media_files: list = None) -> str:
+    def _generate_pdf_file(self, course_data: dict, media_files: list = None, page_count: int = 10) -> str:
         """
         Generate a real PDF file from course data and save to Downloads folder.
         Uses the shared generate_pdf utility function from utils module.
@@ -1443,36 +2046,31 @@ class EnterpriseApp(ctk.CTk):
         Args:
             course_data: Dictionary containing 'title' and 'chapters' list
             media_files: Optional list of media file paths to include
+            page_count: Target page count read from the slider at generation start
             
         Returns:
             str: Path to the generated PDF file
         """
-        from utils import generate_pdf
-        # Get page count from slider (default to 10 if not set)
-        page_count = getattr(self, 'page_count_var', None)
-        target_pages = page_count.get() if page_count else 10
-        return generate_pdf(course_data, page_count=target_pages, media_files=media_files)
+        return generate_pdf(course_data, page_count=page_count, media_files=media_files)
     
-    def _generate_document(self, course_data: dict, media_files: list = None) -> str:
+    def _generate_document(self, course_data: dict, fmt: str, media_files: list = None,
+                           page_count: int = 10) -> str:
         """
-        Generate a document in the selected format from course data.
-        Routes to the appropriate exporter based on self.selected_export_format.
+        Generate a document in the given format from course data.
         
         Args:
             course_data: Dictionary containing 'title' and 'chapters' list
+            fmt: Export format captured at generation start ("PDF", "DOCX", ...)
             media_files: Optional list of media file paths to include
+            page_count: Target page count (used by the PDF exporter)
             
         Returns:
             str: Path to the generated document file
         """
-        # Get selected format (default to PDF)
-        selected_format = getattr(self, 'selected_export_format', 'PDF').upper()
+        selected_format = fmt.upper()
         
-        # DEBUG: Log routing decision to console
-        print(f"DEBUG: SYSTEM: Routing to {selected_format} exporter...")
-        
-        # Log the format being generated
-        self._log_message(f"SYSTEM: Routing to {selected_format} exporter...")
+        # Log the format being generated (runs on the generation worker)
+        self._ui_push(f"SYSTEM: Routing to {selected_format} exporter...")
         
         # Route to appropriate generator based on format
         if selected_format == "DOCX":
@@ -1485,7 +2083,7 @@ class EnterpriseApp(ctk.CTk):
             return self._generate_markdown_file(course_data)
         else:
             # Default to PDF for PDF and unknown formats
-            return self._generate_pdf_file(course_data, media_files)
+            return self._generate_pdf_file(course_data, media_files, page_count)
     
     def _create_project_from_course_data(self, course_data: dict):
         """
@@ -1519,7 +2117,6 @@ class EnterpriseApp(ctk.CTk):
     def _generate_docx_file(self, course_data: dict) -> str:
         """Generate a DOCX file from course data."""
         from docx_exporter import DOCXExporter
-        import os
         
         project = self._create_project_from_course_data(course_data)
         
@@ -1536,7 +2133,6 @@ class EnterpriseApp(ctk.CTk):
     def _generate_html_file(self, course_data: dict) -> str:
         """Generate an HTML file from course data."""
         from html_exporter import HTMLExporter
-        import os
         
         project = self._create_project_from_course_data(course_data)
         
@@ -1553,7 +2149,6 @@ class EnterpriseApp(ctk.CTk):
     def _generate_epub_file(self, course_data: dict) -> str:
         """Generate an EPUB file from course data."""
         from epub_exporter import EPUBExporter
-        import os
         
         project = self._create_project_from_course_data(course_data)
         
@@ -1570,7 +2165,6 @@ class EnterpriseApp(ctk.CTk):
     def _generate_markdown_file(self, course_data: dict) -> str:
         """Generate a Markdown file from course data."""
         from markdown_exporter import MarkdownExporter
-        import os
         
         project = self._create_project_from_course_data(course_data)
         
@@ -1584,6 +2178,49 @@ class EnterpriseApp(ctk.CTk):
         
         return exporter.export()
     
+    def _save_course_json(self, course_data: dict) -> str:
+        """
+        Save generated course data as JSON in the data directory.
+        Called from the generation thread so the UI thread never touches disk.
+        
+        Args:
+            course_data: Generated course data dictionary.
+            
+        Returns:
+            str: Path to the saved JSON file.
+        """
+        # Resolve the output directory once per session
+        if self._courses_dir is None:
+            self._courses_dir = os.path.join(get_data_dir(), "generated_courses")
+        
+        # Create filename from title and timestamp
+        title = course_data.get('title', 'Untitled Course')
+        safe_title = self._title_cache.get(title)
+        if safe_title is None:
+            # Sanitize filename and limit length
+            safe_title = _UNSAFE_FILENAME_CHARS.sub("", title).strip()[:50]
+            # Ensure filename is not empty after sanitization
+            if not safe_title:
+                safe_title = "Course"
+            self._title_cache[title] = safe_title
+        now = datetime.now()
+        timestamp = f"{now.year:04d}{now.month:02d}{now.day:02d}_{now.hour:02d}{now.minute:02d}{now.second:02d}"
+        filename = f"{safe_title}_{timestamp}.json"
+        filepath = os.path.join(self._courses_dir, filename)
+        
+        # Save course data to JSON (compact; json.dump streams encoder chunks
+        # into a 1 MiB buffer, so large courses cost only a few write calls)
+        try:
+            f = open(filepath, 'w', encoding='utf-8', buffering=1 << 20)
+        except FileNotFoundError:
+            # First save (or the folder was removed): create it only now
+            os.makedirs(self._courses_dir, exist_ok=True)
+            f = open(filepath, 'w', encoding='utf-8', buffering=1 << 20)
+        with f:
+            json.dump(course_data, f, separators=(',', ':'), ensure_ascii=False)
+        
+        return filepath
+    
     def _start_generation(self):
         """Start course generation with animated progress and detailed logging."""
         instruction = self.instruction_textbox.get("1.0", "end-1c").strip()
@@ -1592,14 +2229,23 @@ class EnterpriseApp(ctk.CTk):
             messagebox.showwarning("Input Required", "Please enter a master instruction.")
             return
         
-        # Get the target page count from slider
-        target_page_count = getattr(self, 'page_count_var', None)
-        target_pages = target_page_count.get() if target_page_count else 10
+        # The engine is still being built on the startup worker; resume once it
+        # is ready instead of blocking the UI thread (or silently simulating)
+        if not self._engine_future.done():
+            self.generate_btn.configure(state="disabled")
+            self._log_message("⏳ Waiting for the AI engine to finish loading...")
+            self._engine_future.add_done_callback(
+                lambda _: self.after(0, self._resume_generation)
+            )
+            return
         
-        # Get selected output format
-        selected_format = getattr(self, 'selected_export_format', 'PDF')
+        # Read the settings once here; the worker never touches Tk variables
+        target_pages = self.page_count_var.get()
+        selected_format = self.selected_export_format
         
-        # Clear log console
+        # Clear log console (including lines not yet written to it)
+        self._log_buf = io.StringIO()
+        self._log_line_count = 0
         self.log_console.configure(state="normal")
         self.log_console.delete("1.0", "end")
         self.log_console.configure(state="disabled")
@@ -1628,6 +2274,7 @@ class EnterpriseApp(ctk.CTk):
                     return
                 
                 self._log_message(f"✓ {credit_status['message']}")
+                self._set_credits(credit_status['credits'])
             except Exception as e:
                 # Block generation if credit verification fails - prevents unauthorized usage
                 self._log_message(f"❌ Could not verify credits: {str(e)}")
@@ -1642,6 +2289,10 @@ class EnterpriseApp(ctk.CTk):
         # Start progress animation
         self._animate_progress()
         
+        # Paint the progress frame and disabled button before the worker starts
+        # (idle tasks only - no user events are reprocessed here)
+        self.update_idletasks()
+        
         # Store generated course data
         self.generated_course_data = None
         self.generated_pdf_path = None  # Initialize PDF path for consistency
@@ -1653,9 +2304,8 @@ class EnterpriseApp(ctk.CTk):
                 try:
                     # Progress callback to update UI
                     def progress_callback(step, total, message):
-                        # Update progress label on main thread (explicit value capture)
-                        self.after(0, lambda msg=message: self._log_message(msg))
-                        self.after(0, lambda msg=message: self.progress_label.configure(text=msg))
+                        # Log and show the step in one coalesced main-thread update
+                        self._ui_push(message, message)
                     
                     # Generate the full course
                     course_data = self.coursesmith_engine.generate_full_course(
@@ -1666,104 +2316,100 @@ class EnterpriseApp(ctk.CTk):
                     # Store the result
                     self.generated_course_data = course_data
                     
+                    # Save course JSON on this thread; only the outcome goes to the UI
+                    save_error = None
+                    try:
+                        self._save_course_json(course_data)
+                    except Exception as e:
+                        save_error = str(e)
+                    
                     # Generate document in selected format to Downloads folder
-                    fmt = getattr(self, 'selected_export_format', 'PDF')
-                    self.after(0, lambda f=fmt: self._log_message(f"📄 Rendering {f} document..."))
-                    doc_path = self._generate_document(course_data, media_files=self.selected_media_files)
+                    self._ui_push(f"📄 Rendering {selected_format} document...")
+                    doc_path = self._generate_document(course_data, selected_format,
+                                                       media_files=self.selected_media_files,
+                                                       page_count=target_pages)
                     self.generated_pdf_path = doc_path  # Keep variable name for compatibility
                     
                     # Log file save location
                     doc_filename = os.path.basename(doc_path)
-                    self.after(0, lambda fn=doc_filename: self._log_message(f"[System]: File saved to Downloads: {fn}"))
+                    self._ui_push(f"[System]: File saved to Downloads: {doc_filename}")
+                    
+                    # Post-generation log lines, shown together with the completion
+                    post_msgs = []
+                    credits_spent = 0
                     
                     # Deduct credit after successful generation
                     # Note: Credit was already verified before generation started
                     try:
                         from ai_worker import deduct_credit
                         if deduct_credit():
-                            self.after(0, lambda: self._log_message("💳 1 credit deducted from your account."))
+                            credits_spent = 1
+                            post_msgs.append("💳 1 credit deducted from your account.")
                         else:
                             # Log the failure prominently - this indicates a potential issue
-                            self.after(0, lambda: self._log_message("⚠️  WARNING: Could not deduct credit. Please contact support if this persists."))
+                            post_msgs.append("⚠️  WARNING: Could not deduct credit. Please contact support if this persists.")
                             print("ALERT: Credit deduction failed after successful generation")
                     except Exception as credit_err:
                         # Log exception details for debugging
                         error_detail = str(credit_err)
-                        self.after(0, lambda err=error_detail: self._log_message(f"⚠️  Credit deduction error: {err}"))
+                        post_msgs.append(f"⚠️  Credit deduction error: {error_detail}")
                         print(f"ALERT: Credit deduction exception: {error_detail}")
                     
                     # Add email notification log - use actual user email from login
-                    user_email = "user@example.com"
-                    if self.license_data and isinstance(self.license_data, dict):
-                        user_email = self.license_data.get('email', user_email)
-                    self.after(0, lambda: self._log_message("📦 Packaging course..."))
-                    self.after(EMAIL_LOG_DELAY_MS, lambda email=user_email: self._log_message(f"📧 Sending copy to {email}..."))
+                    post_msgs.append("📦 Packaging course...")
+                    post_msgs.append(f"📧 Sending copy to {self.ui_state.user_email}...")
                     
-                    # Notify completion on main thread
-                    self.after(COMPLETION_DELAY_MS, lambda: self._finish_generation(success=True))
+                    # Log, update credits and notify completion in one main-thread callback
+                    self.after(COMPLETION_DELAY_MS, self._finish_generation_with_logs,
+                               post_msgs, credits_spent, save_error)
                     
                 except Exception as e:
                     # Handle errors on main thread (explicit value capture)
                     error_msg = str(e)
-                    self.after(0, lambda err=error_msg: self._log_message(f"❌ Error: {err}"))
-                    self.after(0, lambda err=error_msg: self._finish_generation(success=False, error=err))
+                    self._ui_push(f"❌ Error: {error_msg}")
+                    self.after(0, self._finish_generation, False, error_msg)
             
-            # Run generation in background thread
-            thread = threading.Thread(target=run_generation, daemon=True)
-            thread.start()
+            # Run generation on the persistent generation worker
+            self._gen_executor.submit(run_generation)
         else:
             # Simulated generation with detailed step logging and PDF output
             # Uses sequential delays to provide realistic user feedback ("Matrix effect")
             # Smart Generation: Thinking time scales with page_count selection
+            # More pages = longer thinking time
+            page_multiplier = target_pages / 10.0  # Scale based on pages
+            smart_delay_ms = int(STEP_DELAY_SECONDS * 1000 * max(0.5, min(page_multiplier, 3.0)))  # Clamp between 0.5x and 3x
+            
+            # Calculate unique chapters based on page count (~2 pages per chapter)
+            num_chapters = max(3, target_pages // 2)
+            
+            # Precompute the whole step timeline: (log message, progress label or None, delay after)
+            timeline = [
+                ("[System]: Initializing AI Engine...", "Initializing AI Engine...", smart_delay_ms),
+                ("[AI]: Structuring Course Content...", "Structuring Course Content...", smart_delay_ms),
+                (f"[Structure]: Generating {num_chapters} unique chapters...", None, smart_delay_ms // 2),
+            ]
+            
+            # Log sample chapter titles being generated (show variety) as one
+            # pre-joined block; it keeps the per-sample share of the delay
+            log_limit = min(5, num_chapters)  # Show up to 5 chapter samples
+            sample_delay_ms = int(smart_delay_ms * 0.3)
+            sample_block = "\n".join(
+                f"  [Chapter {idx}]: {ch_type}"
+                for idx, ch_type in enumerate(_SAMPLE_CHAPTER_TYPES[:log_limit], 1)
+            )
+            timeline.append((f"[Generative]: Creating chapters...\n{sample_block}",
+                             f"Creating Chapters 1-{log_limit} of {num_chapters}...",
+                             sample_delay_ms * log_limit))
+            
+            if num_chapters > log_limit:
+                timeline.append((f"[Generative]: Creating {num_chapters - log_limit} more chapters...", None, smart_delay_ms // 2))
+            
+            # Step N+1: Rendering document in selected format
+            timeline.append((f"[{selected_format}]: Rendering document...", f"Rendering {selected_format} document...",
+                             int(PACKAGING_DELAY_SECONDS * 1000)))
+            
             def run_simulated_generation():
-                import time
-                
                 try:
-                    # Calculate dynamic delay based on page count (smart generation)
-                    # More pages = longer thinking time
-                    base_delay = STEP_DELAY_SECONDS
-                    page_multiplier = target_pages / 10.0  # Scale based on pages
-                    smart_delay = base_delay * max(0.5, min(page_multiplier, 3.0))  # Clamp between 0.5x and 3x
-                    
-                    # Step 1: Initializing AI Engine (Matrix effect log sequence)
-                    self.after(0, lambda: self._log_message("[System]: Initializing AI Engine..."))
-                    self.after(0, lambda: self.progress_label.configure(text="Initializing AI Engine..."))
-                    self.after(0, lambda: self.update_idletasks())  # Force UI refresh
-                    time.sleep(smart_delay)
-                    
-                    # Step 2: Structuring Course Content
-                    self.after(0, lambda: self._log_message("[AI]: Structuring Course Content..."))
-                    self.after(0, lambda: self.progress_label.configure(text="Structuring Course Content..."))
-                    self.after(0, lambda: self.update_idletasks())  # Force UI refresh
-                    time.sleep(smart_delay)
-                    
-                    # Calculate unique chapters based on page count (~2 pages per chapter)
-                    num_chapters = max(3, target_pages // 2)
-                    self.after(0, lambda nc=num_chapters: self._log_message(f"[Structure]: Generating {nc} unique chapters..."))
-                    self.after(0, lambda: self.update_idletasks())  # Force UI refresh
-                    time.sleep(smart_delay * 0.5)
-                    
-                    # Log sample chapter titles being generated (show variety)
-                    sample_chapter_types = ["Introduction", "Core Concepts", "Methodology", "Implementation", "Case Studies", "Best Practices", "Advanced Topics", "Future Directions"]
-                    log_limit = min(5, num_chapters)  # Show up to 5 chapter samples
-                    for ch_idx in range(log_limit):
-                        ch_type = sample_chapter_types[ch_idx % len(sample_chapter_types)]
-                        self.after(0, lambda idx=ch_idx+1, ct=ch_type: self._log_message(f"[Generative]: Creating Chapter {idx}: {ct}..."))
-                        self.after(0, lambda idx=ch_idx+1: self.progress_label.configure(text=f"Creating Chapter {idx} of {num_chapters}..."))
-                        self.after(0, lambda: self.update_idletasks())  # Force UI refresh
-                        time.sleep(smart_delay * 0.3)
-                    
-                    if num_chapters > log_limit:
-                        self.after(0, lambda nc=num_chapters, ll=log_limit: self._log_message(f"[Generative]: Creating {nc - ll} more chapters..."))
-                        time.sleep(smart_delay * 0.5)
-                    
-                    # Step N+1: Rendering document in selected format
-                    fmt = getattr(self, 'selected_export_format', 'PDF')
-                    self.after(0, lambda f=fmt: self._log_message(f"[{f}]: Rendering document..."))
-                    self.after(0, lambda f=fmt: self.progress_label.configure(text=f"Rendering {f} document..."))
-                    self.after(0, lambda: self.update_idletasks())  # Force UI refresh
-                    time.sleep(PACKAGING_DELAY_SECONDS)
-                    
                     # Create course data - generator will handle UNIQUE chapter generation
                     # We pass minimal data; the procedural generator creates unique content
                     course_data = {
@@ -1774,78 +2420,163 @@ class EnterpriseApp(ctk.CTk):
                     
                     self.generated_course_data = course_data
                     
+                    # Save course JSON on this thread; only the outcome goes to the UI
+                    save_error = None
+                    try:
+                        self._save_course_json(course_data)
+                    except Exception as e:
+                        save_error = str(e)
+                    
                     # Generate document file in selected format to Downloads folder
-                    # Routes to appropriate exporter based on selected_export_format
-                    doc_path = self._generate_document(course_data, media_files=self.selected_media_files)
+                    # Routes to the exporter for the format captured at start
+                    doc_path = self._generate_document(course_data, selected_format,
+                                                       media_files=self.selected_media_files,
+                                                       page_count=target_pages)
                     
                     # Step N+2: File saved to Downloads (include filename)
                     doc_filename = os.path.basename(doc_path)
-                    self.after(0, lambda fn=doc_filename: self._log_message(f"[System]: File saved to Downloads: {fn}"))
-                    self.after(0, lambda: self.update_idletasks())  # Force UI refresh
+                    self._ui_push(f"[System]: File saved to Downloads: {doc_filename}")
                     
                     # Store document path for success message
                     self.generated_pdf_path = doc_path  # Keep variable name for compatibility
                     
                     # Notify completion on main thread
-                    self.after(0, lambda: self._finish_generation(success=True))
+                    self.after(0, self._finish_generation, True, None, save_error)
                     
                 except Exception as e:
                     # Handle errors on main thread (explicit value capture)
                     error_msg = str(e)
-                    self.after(0, lambda err=error_msg: self._log_message(f"❌ Error: {err}"))
-                    self.after(0, lambda err=error_msg: self._finish_generation(success=False, error=err))
+                    self._ui_push(f"❌ Error: {error_msg}")
+                    self.after(0, self._finish_generation, False, error_msg)
             
-            # Run simulated generation in background thread
-            thread = threading.Thread(target=run_simulated_generation, daemon=True)
-            thread.start()
+            # Play the timeline on the Tk event loop (no worker thread sleeps through it),
+            # then render the document on the persistent generation worker
+            self._play_simulated_steps(iter(timeline), run_simulated_generation)
+    
+    def _play_simulated_steps(self, steps, on_done):
+        """
+        Show the next simulated generation step and chain to the one after it.
+        
+        Only one after() callback is pending at a time; each step schedules its
+        successor after its own delay.
+        
+        Args:
+            steps: Iterator of (log message, progress label or None, delay in ms).
+            on_done: Callable submitted to the generation worker after the last step.
+        """
+        step = next(steps, None)
+        if step is None:
+            self._gen_executor.submit(on_done)
+            return
+        log_msg, label, delay_ms = step
+        self._log_message(log_msg)
+        if label is not None:
+            self.progress_label.configure(text=label)
+        self.after(delay_ms, self._play_simulated_steps, steps, on_done)
+    
+    def _resume_generation(self):
+        """Start the generation that was deferred until the engine finished loading."""
+        self.generate_btn.configure(state="normal")
+        self._start_generation()
     
     def _animate_progress(self):
-        """Animate progress bar smoothly."""
-        if not self.progress_animation_running:
-            self.progress_animation_running = True
-            self.progress_bar.set(0)
+        """Animate progress bar using Tk's native indeterminate mode."""
+        if not self.ui_state.progress_animation_running:
+            self.ui_state.progress_animation_running = True
+            # The bar animates inside Tk's event loop; Python only drives the label
+            self.progress_bar.configure(mode="indeterminate")
+            self.progress_bar.start()
+            self._last_progress_msg = None
+            self._paused_progress_value = None
             self._update_progress_animation(0)
     
     def _update_progress_animation(self, value):
-        """Update progress bar animation."""
-        if self.progress_animation_running and self.winfo_exists():
-            # Increment progress
-            value = min(value + 0.01, 0.95)  # Max at 95% until complete
-            self.progress_bar.set(value)
+        """Advance the progress label through its phases until the final one."""
+        if self.ui_state.progress_animation_running and self.winfo_exists():
+            if not self._window_visible or self.ui_state.current_tab != "forge":
+                # Minimized or on another tab: stop ticking until
+                # _on_visibility_change / _switch_tab resume from here
+                self._paused_progress_value = value
+                return
             
-            # Update label with different messages
-            if value < 0.3:
-                self.progress_label.configure(text="Analyzing your instruction...")
-            elif value < 0.6:
-                self.progress_label.configure(text="Generating course structure...")
-            elif value < 0.9:
-                self.progress_label.configure(text="Creating content...")
-            else:
-                self.progress_label.configure(text="Finalizing your course...")
+            value = min(value + 0.02, 0.95)  # Max at 95% until complete
+            
+            # Update label only when the phase changes
+            message = _PROGRESS_MSGS[bisect.bisect_right(_PROGRESS_THRESHOLDS, value)]
+            if message != self._last_progress_msg:
+                self._last_progress_msg = message
+                self.progress_label.configure(text=message)
             
-            # Continue animation
-            self.after(50, lambda: self._update_progress_animation(value))
+            # Stop ticking once the last phase is reached; engine steps take over
+            if value < 0.95:
+                self.after(PROGRESS_TICK_MS, self._update_progress_animation, value)
+    
+    def _ui_push(self, log_msg, label_text=None):
+        """
+        Queue a log line and optional progress label update from a worker thread.
+        
+        Bursts of worker events collapse into a single scheduled _ui_apply call
+        that logs every line and shows only the newest label.
+        
+        Args:
+            log_msg: Line to add to the logging console.
+            label_text: Progress text to display, or None to leave it unchanged.
+        """
+        with self._progress_lock:
+            self._pending_log_msgs.append(log_msg)
+            if label_text is not None:
+                self._pending_progress_msg = label_text
+            if self._progress_update_scheduled:
+                return
+            self._progress_update_scheduled = True
+        self.after(0, self._ui_apply)
+    
+    def _ui_apply(self):
+        """Apply everything queued by _ui_push (runs on the Tk thread)."""
+        with self._progress_lock:
+            log_msgs, self._pending_log_msgs = self._pending_log_msgs, []
+            message = self._pending_progress_msg
+            self._pending_progress_msg = None
+            self._progress_update_scheduled = False
+        for log_msg in log_msgs:
+            self._log_message(log_msg)
+        if message is not None:
+            self.progress_label.configure(text=message)
     
     def _stop_progress_animation(self):
         """Stop progress bar animation."""
-        self.progress_animation_running = False
+        self.ui_state.progress_animation_running = False
+        self.progress_bar.stop()
+        self.progress_bar.configure(mode="determinate")
         self.progress_bar.set(1.0)
         self.progress_label.configure(text="Course generation complete!")
     
-    def _finish_generation(self, success=True, error=None):
+    def _finish_generation_with_logs(self, post_msgs, credits_spent, save_error=None):
+        """
+        Log the post-generation messages and finish a successful real generation.
+        
+        Args:
+            post_msgs: Log lines collected by the worker after the document was saved.
+            credits_spent: Credits deducted server-side (0 if deduction failed).
+            save_error: Error message if the course JSON could not be saved.
+        """
+        for msg in post_msgs:
+            self._log_message(msg)
+        if credits_spent:
+            self._on_credit_deducted(credits_spent)
+        self._finish_generation(True, None, save_error)
+    
+    def _finish_generation(self, success=True, error=None, save_error=None):
         """
         Finish generation and show result.
         
         Args:
             success: Whether generation succeeded.
             error: Error message if generation failed.
+            save_error: Error message if the course JSON could not be saved.
         """
         self._stop_progress_animation()
         
-        # Get selected output format for logging
-        selected_format = getattr(self, 'selected_export_format', 'PDF')
-        
-        # Show completion for a moment
         def complete_generation():
             self.progress_frame.pack_forget()
             self.generate_btn.configure(state="normal")
@@ -1856,52 +2587,27 @@ class EnterpriseApp(ctk.CTk):
                 chapter_count = len(self.generated_course_data.get('chapters', []))
                 self._log_message(f"✅ Generation complete: '{course_title}' ({chapter_count} chapters)")
                 
-                # Save generated course to data directory
-                try:
-                    from utils import get_data_dir
-                    data_dir = get_data_dir()
-                    courses_dir = os.path.join(data_dir, "generated_courses")
-                    os.makedirs(courses_dir, exist_ok=True)
-                    
-                    # Create filename from title and timestamp
-                    title = self.generated_course_data.get('title', 'Untitled Course')
-                    # Sanitize filename
-                    safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-                    safe_title = safe_title[:50]  # Limit length
-                    # Ensure filename is not empty after sanitization
-                    if not safe_title:
-                        safe_title = "Course"
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"{safe_title}_{timestamp}.json"
-                    filepath = os.path.join(courses_dir, filename)
-                    
-                    # Save course data to JSON
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        json.dump(self.generated_course_data, f, indent=2, ensure_ascii=False)
-                    
-                    # Show success message with PDF path prominently displayed
-                    if hasattr(self, 'generated_pdf_path') and self.generated_pdf_path:
-                        messagebox.showinfo(
-                            "Success!", 
-                            f"PDF saved to:\n{self.generated_pdf_path}"
-                        )
-                    else:
-                        # Fallback if PDF path not available
-                        course_title = self.generated_course_data.get('title', 'Course')
-                        chapter_count = len(self.generated_course_data.get('chapters', []))
-                        messagebox.showinfo(
-                            "Success", 
-                            f"Course generated successfully!\n\n"
-                            f"Title: {course_title}\n"
-                            f"Chapters: {chapter_count}\n"
-                            f"Language: {self.generated_course_data.get('language', 'en')}"
-                        )
-                except Exception as save_error:
+                if save_error:
                     # Still show success but mention save error
                     messagebox.showwarning(
                         "Partial Success",
                         f"Course generated successfully but failed to save:\n{save_error}"
                     )
+                elif self.generated_pdf_path:
+                    # Show success message with PDF path prominently displayed
+                    messagebox.showinfo(
+                        "Success!", 
+                        f"PDF saved to:\n{self.generated_pdf_path}"
+                    )
+                else:
+                    # Fallback if PDF path not available
+                    messagebox.showinfo(
+                        "Success", 
+                        f"Course generated successfully!\n\n"
+                        f"Title: {course_title}\n"
+                        f"Chapters: {chapter_count}\n"
+                        f"Language: {self.generated_course_data.get('language', 'en')}"
+                    )
             elif success:
                 # Success but no data (shouldn't happen)
                 messagebox.showwarning("Warning", "Course generation completed but no data was returned.")
@@ -1914,7 +2620,8 @@ class EnterpriseApp(ctk.CTk):
                     "Please check your API key and internet connection."
                 )
         
-        self.after(1000, complete_generation)
+        # The result dialog itself signals completion; no extra pause needed
+        complete_generation()
     
     def _clear_instruction(self):
         """Clear the instruction textbox."""
@@ -1923,6 +2630,10 @@ class EnterpriseApp(ctk.CTk):
 
 def main():
     """Initialize and run the CourseSmith ENTERPRISE application."""
+    # Start importing the Supabase client now so it overlaps .env loading and
+    # Tk root construction instead of delaying the startup license checks
+    threading.Thread(target=_prewarm_supabase, daemon=True).start()
+    
     # Load environment variables with PyInstaller support
     # Try to find .env in the executable directory (works for both dev and EXE)
     try:
@@ -1934,10 +2645,11 @@ def main():
     
     env_path = os.path.join(base_path, ".env")
     
-    # Load .env if it exists
-    if os.path.exists(env_path):
-        load_dotenv(env_path)
-    else:
+    # Load .env if it exists (load_dotenv returns False for a missing file).
+    # Imported here: nothing else needs python-dotenv, so importing main.py
+    # (tests, tooling) doesn't pay for it
+    from dotenv import load_dotenv
+    if not load_dotenv(env_path):
         # Fallback to current directory for development
         load_dotenv()
     
@@ -1947,6 +2659,12 @@ def main():
     # Create custom theme with enterprise colors
     ctk.set_default_color_theme("blue")
     
+    # Set widget scaling before any widget exists so nothing is re-laid out later.
+    # CustomTkinter already applies the system DPI scale on its own; this is an
+    # extra user multiplier on top of it (e.g. 1.25 for 125%), so keep it at 1.0
+    # rather than feeding in the detected DPI, which would scale twice.
+    ctk.set_widget_scaling(1.0)
+    
     # Create and run the enterprise application
     app = EnterpriseApp()
 
@@ -1955,7 +2673,13 @@ def main():
     ban_thread = threading.Thread(target=check_remote_ban, args=(app,), daemon=True)
     ban_thread.start()
 
-    app.mainloop()
+    try:
+        app.mainloop()
+    except LicenseRevoked:
+        # Revoked/expired license: tear Tk down cleanly, then let the exception
+        # exit with status 1 and its message on stderr (the log file when frozen)
+        app.destroy()
+        raise
 
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+"""
+Test suite for device binding: used_hwids parsing/matching and the
+single-flight device lookup in main.py.
+"""
+
+import time
+import threading
+
+import pytest
+
+from utils import parse_hwids_array, license_covers_device
+
+
+def test_parse_hwids_array():
+    """used_hwids arrives as a list, a legacy JSON string, or nothing."""
+    print("Testing used_hwids parsing...")
+    assert parse_hwids_array(["A", "B"]) == ["A", "B"]
+    assert parse_hwids_array('["A", "B"]') == ["A", "B"]
+    print("✓ Lists and legacy JSON strings parse to lists")
+
+    assert parse_hwids_array(None) == []
+    assert parse_hwids_array("not json") == []
+    assert parse_hwids_array('"ABC"') == [], "A JSON scalar must not become a str"
+    assert parse_hwids_array(42) == []
+    print("✓ Missing and malformed values parse to []")
+
+
+def test_license_covers_device():
+    """Only an exact used_hwids entry binds the device."""
+    print("Testing device matching...")
+    assert license_covers_device({"used_hwids": ["HWID-1", "HWID-2"]}, "HWID-2")
+    assert license_covers_device({"used_hwids": '["HWID-1"]'}, "HWID-1")
+    print("✓ Listed devices match (list and legacy string)")
+
+    assert not license_covers_device({"used_hwids": '["HWID-12"]'}, "HWID-1"), \
+        "A partial HWID must not match inside a JSON string"
+    assert not license_covers_device({"hwid": "HWID-1"}, "HWID-1"), \
+        "The single hwid column alone does not sign a device in"
+    assert not license_covers_device({"used_hwids": None}, "HWID-1")
+    print("✓ Partial, hwid-only and empty rows do not match")
+
+
+class _FakeResponse:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._rows
+
+
+class _FakeClient:
+    """Stands in for the Supabase client: postgrest.session.get runs `get`."""
+
+    def __init__(self, get):
+        self.postgrest = self
+        self.session = self
+        self.get = get
+
+
+def _with_client(main, get, fn):
+    """Run fn with main._get_supabase returning a fake client, then restore it."""
+    original = main._get_supabase
+    main._get_supabase = lambda: _FakeClient(get)
+    try:
+        return fn()
+    finally:
+        main._get_supabase = original
+
+
+def test_lookup_device_retries_after_error():
+    """A failed lookup is not remembered; the next call asks the server again."""
+    pytest.importorskip("customtkinter")
+    import main
+
+    print("Testing device lookup failure handling...")
+    calls = []
+
+    def get(path, params):
+        calls.append(params)
+        if len(calls) == 1:
+            raise ConnectionError("network down")
+        return _FakeResponse([{"hwid": "HWID-1"}])
+
+    def run():
+        with pytest.raises(ConnectionError):
+            main._lookup_device("HWID-1")
+        return main._lookup_device("HWID-1")
+
+    assert _with_client(main, get, run) == [{"hwid": "HWID-1"}]
+    assert len(calls) == 2
+    print("✓ Transient error is retried on the next lookup")
+
+
+def test_lookup_device_shares_in_flight_request():
+    """Concurrent callers share one request; later callers get a fresh one."""
+    pytest.importorskip("customtkinter")
+    import main
+
+    print("Testing single-flight device lookup...")
+    calls = []
+    in_request = threading.Event()
+    release = threading.Event()
+
+    def get(path, params):
+        calls.append(params)
+        in_request.set()
+        release.wait(5)
+        return _FakeResponse([{"call": len(calls)}])
+
+    def run():
+        results = []
+        lookup = lambda: results.append(main._lookup_device("HWID-1"))
+        first = threading.Thread(target=lookup)
+        first.start()
+        assert in_request.wait(5)
+        # The second caller arrives while the first request is in flight
+        second = threading.Thread(target=lookup)
+        second.start()
+        time.sleep(0.2)
+        release.set()
+        first.join(5)
+        second.join(5)
+        return results, main._lookup_device("HWID-1")
+
+    results, later = _with_client(main, get, run)
+    assert results == [[{"call": 1}], [{"call": 1}]], "Both callers share one request"
+    assert later == [{"call": 2}], "A finished lookup must not be memoized"
+    print("✓ In-flight request is shared and not kept afterwards")
+
+if __name__ == "__main__":
+    test_parse_hwids_array()
+    test_license_covers_device()
+    test_lookup_device_retries_after_error()
+    test_lookup_device_shares_in_flight_request()
+    print("\n✓ All device binding tests passed!")
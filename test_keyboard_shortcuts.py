@@ -4,10 +4,20 @@ This tests the global hotkey override implementation.
 """
 import sys
 import os
+import ast
 
 # Get the directory where the script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 
+
+def imports_from_utils(source, name):
+    """Return True if source has a `from utils import ...` that includes name."""
+    return any(
+        isinstance(node, ast.ImportFrom) and node.module == "utils"
+        and any(alias.name == name for alias in node.names)
+        for node in ast.walk(ast.parse(source))
+    )
+
 def test_global_shortcuts():
     """Test that global shortcuts are bound correctly."""
     print("\n=== Testing Global Keyboard Shortcuts Implementation ===\n")
@@ -17,7 +27,7 @@ def test_global_shortcuts():
     try:
         with open(os.path.join(SCRIPT_DIR, 'main.py'), 'r') as f:
             content = f.read()
-            assert 'from utils import setup_global_window_shortcuts' in content, "Missing import of setup_global_window_shortcuts"
+            assert imports_from_utils(content, 'setup_global_window_shortcuts'), "Missing import of setup_global_window_shortcuts"
             assert 'setup_global_window_shortcuts(self)' in content, "Missing call to setup_global_window_shortcuts"
         print("✓ main.py has global shortcuts configured correctly")
     except AssertionError as e:
@@ -32,7 +42,7 @@ def test_global_shortcuts():
     try:
         with open(os.path.join(SCRIPT_DIR, 'admin_keygen.py'), 'r') as f:
             content = f.read()
-            assert 'from utils import setup_global_window_shortcuts' in content, "Missing import of setup_global_window_shortcuts"
+            assert imports_from_utils(content, 'setup_global_window_shortcuts'), "Missing import of setup_global_window_shortcuts"
             assert 'setup_global_window_shortcuts(self)' in content, "Missing call to setup_global_window_shortcuts"
         print("✓ admin_keygen.py has global shortcuts configured correctly")
     except AssertionError as e:
@@ -103,13 +113,13 @@ def test_global_shortcuts():
         # Verify main.py imports and uses the utility function
         with open(os.path.join(SCRIPT_DIR, 'main.py'), 'r') as f:
             content = f.read()
-            assert 'from utils import setup_global_window_shortcuts' in content, "main.py not importing setup_global_window_shortcuts"
+            assert imports_from_utils(content, 'setup_global_window_shortcuts'), "main.py not importing setup_global_window_shortcuts"
             assert 'setup_global_window_shortcuts(self)' in content, "main.py not calling setup_global_window_shortcuts"
             
         # Verify admin_keygen.py imports and uses the utility function
         with open(os.path.join(SCRIPT_DIR, 'admin_keygen.py'), 'r') as f:
             content = f.read()
-            assert 'from utils import setup_global_window_shortcuts' in content, "admin_keygen.py not importing setup_global_window_shortcuts"
+            assert imports_from_utils(content, 'setup_global_window_shortcuts'), "admin_keygen.py not importing setup_global_window_shortcuts"
             assert 'setup_global_window_shortcuts(self)' in content, "admin_keygen.py not calling setup_global_window_shortcuts"
             
         print("✓ Global shortcuts properly detect focused widgets")
@@ -0,0 +1,139 @@
+"""
+Test suite for the signed local license cache (license_cache.py).
+"""
+
+import os
+import json
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+
+import license_cache
+
+@contextmanager
+def _temp_cache():
+    """Point license_cache at a fresh temporary file; restore and clean up after."""
+    tmp_dir = tempfile.mkdtemp()
+    original = license_cache.CACHE_PATH
+    # CACHE_PATH also locates the per-device signing key (license_cache.key)
+    license_cache.CACHE_PATH = os.path.join(tmp_dir, "license_cache.json")
+    try:
+        yield license_cache.CACHE_PATH
+    finally:
+        license_cache.CACHE_PATH = original
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _record(checked_at, valid_until=None, hwid="HWID-1"):
+    return {
+        "hwid": hwid,
+        "valid_until": valid_until,
+        "checked_at": checked_at.isoformat(),
+    }
+
+
+def test_round_trip():
+    """A saved record loads back unchanged with this device's key."""
+    print("Testing save/load round trip...")
+    with _temp_cache():
+        record = _record(datetime.now(timezone.utc))
+        license_cache.save(record)
+        assert license_cache.load() == record
+        print("✓ Record round-trips")
+
+        with open(license_cache._key_path(), 'wb') as f:
+            f.write(os.urandom(license_cache.KEY_BYTES))
+        assert license_cache.load() is None, "Another key must not verify"
+        print("✓ Record signed with another key is rejected")
+
+
+def test_public_key_cannot_sign():
+    """Signing with the app's shipped Supabase key does not produce a valid cache."""
+    print("Testing that only the device key signs...")
+    with _temp_cache() as path:
+        license_cache.save(_record(datetime.now(timezone.utc)))
+        record = _record(datetime.now(timezone.utc), "2999-01-01T00:00:00+00:00")
+        forged = {"record": record, "sig": license_cache._sign(record, b"sb_publishable_key")}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(forged, f)
+        assert license_cache.load() is None
+    print("✓ Record signed with a non-device key is rejected")
+
+
+def test_missing_key_is_a_miss():
+    """Without the device key file nothing verifies; clear() removes the record."""
+    print("Testing missing key / clear...")
+    with _temp_cache():
+        license_cache.save(_record(datetime.now(timezone.utc)))
+        os.remove(license_cache._key_path())
+        assert license_cache.load() is None
+        print("✓ Missing key file is a miss")
+
+        license_cache.save(_record(datetime.now(timezone.utc)))
+        assert license_cache.load() is not None
+        license_cache.clear()
+        assert license_cache.load() is None
+        license_cache.clear()  # Clearing twice is harmless
+        print("✓ clear() drops the cached record")
+
+
+def test_tampered_cache_rejected():
+    """Editing the cached expiry invalidates the signature."""
+    print("Testing tamper detection...")
+    with _temp_cache() as path:
+        license_cache.save(_record(datetime.now(timezone.utc), "2000-01-01T00:00:00+00:00"))
+
+        with open(path, 'r', encoding='utf-8') as f:
+            blob = json.load(f)
+        blob["record"]["valid_until"] = "2999-01-01T00:00:00+00:00"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(blob, f)
+
+        assert license_cache.load() is None, "Tampered record must not load"
+    print("✓ Hand-edited expiry is rejected")
+
+
+def test_missing_or_corrupt_cache():
+    """Missing and unparsable files are cache misses."""
+    print("Testing missing/corrupt cache...")
+    with _temp_cache() as path:
+        assert license_cache.load() is None
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("not json")
+        assert license_cache.load() is None
+    print("✓ Missing and corrupt files are misses")
+
+
+def test_is_fresh():
+    """Freshness requires matching HWID, a recent check and a future expiry."""
+    print("Testing freshness rules...")
+    now = datetime.now(timezone.utc)
+    future = (now + timedelta(days=30)).isoformat()
+    past = (now - timedelta(days=1)).isoformat()
+
+    assert license_cache.is_fresh(_record(now - timedelta(hours=1), future), "HWID-1", now)
+    assert license_cache.is_fresh(_record(now - timedelta(hours=1)), "HWID-1", now)
+    print("✓ Recent check with future/no expiry is fresh")
+
+    assert not license_cache.is_fresh(_record(now - timedelta(hours=1), future), "HWID-2", now)
+    print("✓ Other device's record is not fresh")
+
+    assert not license_cache.is_fresh(_record(now - timedelta(hours=7), future), "HWID-1", now)
+    print("✓ Check older than CACHE_TTL is not fresh")
+
+    assert not license_cache.is_fresh(_record(now - timedelta(hours=1), past), "HWID-1", now)
+    print("✓ Expired license is not fresh")
+
+    assert not license_cache.is_fresh(None, "HWID-1", now)
+    print("✓ No record is not fresh")
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_public_key_cannot_sign()
+    test_missing_key_is_a_miss()
+    test_tampered_cache_rejected()
+    test_missing_or_corrupt_cache()
+    test_is_fresh()
+    print("\n✓ All license cache tests passed!")
@@ -6,6 +6,7 @@ and HWID/license checking utilities.
 """
 
 import os
+import re
 import sys
 import json
 import subprocess
@@ -16,12 +17,17 @@ from tkinter import Menu, TclError
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
+# Prefer orjson (C/SIMD parser) for JSON coming back from Supabase; fall back to stdlib
+try:
+    import orjson as _fast_json
+except ImportError:
+    _fast_json = json
+
 # Global flag to track if scrollbar patch has been applied (prevents multiple patches)
 _SCROLLBAR_PATCHED = False
 
-# ReportLab imports for font registration
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+# Characters dropped from titles when building output filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w \-]+")
 
 
 def patch_ctk_scrollbar():
@@ -123,7 +129,11 @@ def _register_roboto_fonts():
                 _fonts_available = False
                 return False
             
-            # Register fonts
+            # Register fonts (reportlab is imported here, not at module load,
+            # so importing utils for HWID/shortcut helpers stays cheap at startup)
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+            
             pdfmetrics.registerFont(TTFont('Roboto', roboto_regular_path))
             pdfmetrics.registerFont(TTFont('Roboto-Bold', roboto_bold_path))
             
@@ -660,11 +670,44 @@ def setup_global_window_shortcuts(window):
 
 # ==================== HWID & LICENSE UTILITIES ====================
 
+# Columns of the 'licenses' table the desktop app actually reads.
+# Request these explicitly instead of select("*") so large columns added to the
+# table later are never shipped to clients. Add new fields here when needed.
+LICENSE_COLUMNS = "license_key,email,tier,credits,is_banned,valid_until,hwid,used_hwids,max_devices"
+
+
+# Process-wide HWID cache (the hardware ID cannot change while we run)
+_hwid_lock = threading.Lock()
+_hwid = None
+
+
 def get_hwid() -> str:
     """
     Get the Windows Hardware ID (UUID) using wmic command with robust fallback.
     This is the primary method for identifying unique devices for license management.
     
+    The first successful lookup is cached for the process, so the startup
+    license checks share one wmic call; concurrent callers wait for it.
+    "UNKNOWN_ID" is not cached, so a transient wmic failure can be retried.
+    
+    Returns:
+        str: The hardware UUID or "UNKNOWN_ID" if an error occurs.
+    """
+    global _hwid
+    
+    with _hwid_lock:
+        if _hwid is None:
+            hwid = _query_hwid()
+            if hwid != "UNKNOWN_ID":
+                _hwid = hwid
+            return hwid
+        return _hwid
+
+
+def _query_hwid() -> str:
+    """
+    Query wmic for the hardware ID (uncached; see get_hwid).
+    
     SECURITY NOTE: This function uses shell=True as specified in requirements.
     This is less secure than shell=False with argument list. The command is hardcoded
     to prevent injection attacks, but consider using shell=False if requirements allow.
@@ -729,13 +772,33 @@ def parse_hwids_array(hwids_value) -> list:
     if isinstance(hwids_value, list):
         return hwids_value
     if isinstance(hwids_value, str):
+        # Legacy rows store the array as a JSON-encoded string
         try:
-            return json.loads(hwids_value)
+            parsed = _fast_json.loads(hwids_value)
         except Exception:
             return []
+        return parsed if isinstance(parsed, list) else []
     return []
 
 
+def license_covers_device(record: Dict[str, Any], hwid: str) -> bool:
+    """
+    Check whether a license row lists this device in its used_hwids.
+    
+    This is the rule main.py uses to pick the row that signs a device in.
+    Legacy rows that store used_hwids as a JSON string are parsed first, so
+    a partial HWID never counts as a substring match.
+    
+    Args:
+        record: License row from the database
+        hwid: Current hardware ID
+        
+    Returns:
+        bool: True if hwid is one of the row's used_hwids
+    """
+    return hwid in parse_hwids_array(record.get("used_hwids"))
+
+
 def is_device_limit_reached(used_hwids: list, max_devices: int) -> bool:
     """
     Check if the device limit has been reached for a license.
@@ -821,7 +884,7 @@ def check_license(license_key: str, email: str, supabase_url: str, supabase_key:
         supabase = create_client(supabase_url, supabase_key)
         
         # Query Supabase for a row matching BOTH email AND key
-        response = supabase.table("licenses").select("*").eq("license_key", license_key).eq("email", email).execute()
+        response = supabase.table("licenses").select(LICENSE_COLUMNS).eq("license_key", license_key).eq("email", email).execute()
         
         # If not found -> Return "Invalid Credentials"
         if not response.data or len(response.data) == 0:
@@ -955,6 +1018,13 @@ _BULLET_POINTS = [
     "Insight: Learn from both successes and failures"
 ]
 
+# Closing paragraph for longer chapters (formatted with the chapter topic)
+_SUMMARY_TEMPLATE = (
+    "In summary, this chapter has provided essential insights into {topic}. "
+    "The concepts covered here form a critical foundation for understanding the "
+    "subsequent material and applying these principles effectively."
+)
+
 
 def _generate_unique_chapter_title(chapter_num: int, total_chapters: int) -> str:
     """
@@ -1038,16 +1108,14 @@ def _generate_chapter_content(chapter_num: int, total_chapters: int, chapter_tit
             bullet_start = (seed + chapter_num) % len(_BULLET_POINTS)
             # Use chapter_num // 3 for actual variation (3, 4, or 5 bullets)
             num_bullets = 3 + ((chapter_num // 3) % 3)
-            bullets = []
-            for b in range(num_bullets):
-                bullet_idx = (bullet_start + b) % len(_BULLET_POINTS)
-                bullets.append(f"• {_BULLET_POINTS[bullet_idx]}")
-            content_parts.append("\n".join(bullets))
+            content_parts.append("\n".join(
+                "• " + _BULLET_POINTS[(bullet_start + b) % len(_BULLET_POINTS)]
+                for b in range(num_bullets)
+            ))
     
     # Add a summary paragraph for longer chapters
     if num_paragraphs >= 4:
-        summary = f"In summary, this chapter has provided essential insights into {topic}. The concepts covered here form a critical foundation for understanding the subsequent material and applying these principles effectively."
-        content_parts.append(summary)
+        content_parts.append(_SUMMARY_TEMPLATE.format(topic=topic))
     
     return "\n\n".join(content_parts)
 
@@ -1103,8 +1171,7 @@ def generate_pdf(course_data: Dict[str, Any], page_count: int = 10, output_path:
         os.makedirs(downloads_dir, exist_ok=True)
         
         title = course_data.get('title', 'Untitled Course')
-        safe_title = "".join(c for c in title if c.isalnum() or c in (' ', '-', '_')).strip()
-        safe_title = safe_title[:50] if safe_title else "Course"
+        safe_title = _UNSAFE_FILENAME_CHARS.sub("", title).strip()[:50] or "Course"
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{safe_title}_{timestamp}.pdf"
         output_path = os.path.join(downloads_dir, filename)